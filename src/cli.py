@@ -4,7 +4,8 @@ import io
 import logging
 import sys
 import time
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import fields
 from datetime import date
 from pathlib import Path
 
@@ -16,24 +17,14 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
+# Těžké moduly (fetchery, sklearn, NumPy, anthropic, BigQuery) se importují až v příkazech, které je potřebují
 from src.config_loader import load_config, load_keywords
 from src.fetchers.base import FetchedItem
-from src.fetchers.google_news import GoogleNewsFetcher
-from src.fetchers.google_trends import GoogleTrendsFetcher
-from src.fetchers.hackernews import HackerNewsFetcher
-from src.fetchers.linkedin_rss import LinkedInRSSFetcher
-from src.fetchers.reddit import RedditFetcher
-from src.processing.categorizer import TopicCategorizer
-from src.processing.clustering import TopicClusterer
-from src.processing.extractor import KeywordExtractor
-from src.processing.scorer import TrendScorer
-from src.processing.summarizer import TopicSummarizer
 from src.reporting.console import ConsoleReporter
 from src.reporting.email_report import EmailReporter
 from src.reporting.export import ReportExporter
-from src.storage.bigquery_dedup import BigQueryDedup
+from src.storage.feed_cache import FeedCache
 from src.storage.fetch_cache import FetchCache
-from src.storage.history import HistoryTracker
 from src.storage.store import DataStore
 
 # Kořenový adresář projektu
@@ -42,14 +33,25 @@ CONFIG_DIR = PROJECT_ROOT / "config"
 
 console = Console()
 
-# Registry fetcherů
-FETCHER_REGISTRY = {
-    "google_news": GoogleNewsFetcher,
-    "reddit": RedditFetcher,
-    "hackernews": HackerNewsFetcher,
-    "google_trends": GoogleTrendsFetcher,
-    "linkedin_rss": LinkedInRSSFetcher,
-}
+# Názvy polí FetchedItem – mělký převod na dict bez rekurzivního asdict()
+_ITEM_FIELDS = tuple(f.name for f in fields(FetchedItem))
+
+
+def _get_registry() -> dict[str, type]:
+    """Registry fetcherů – importuje fetchery až při prvním použití."""
+    from src.fetchers.google_news import GoogleNewsFetcher
+    from src.fetchers.google_trends import GoogleTrendsFetcher
+    from src.fetchers.hackernews import HackerNewsFetcher
+    from src.fetchers.linkedin_rss import LinkedInRSSFetcher
+    from src.fetchers.reddit import RedditFetcher
+
+    return {
+        "google_news": GoogleNewsFetcher,
+        "reddit": RedditFetcher,
+        "hackernews": HackerNewsFetcher,
+        "google_trends": GoogleTrendsFetcher,
+        "linkedin_rss": LinkedInRSSFetcher,
+    }
 
 
 def _setup_logging(verbose: bool) -> None:
@@ -66,6 +68,7 @@ def _fetch_all(
     config: dict,
     source_filter: list[str] | None = None,
     fetch_cache: FetchCache | None = None,
+    feed_cache: FeedCache | None = None,
 ) -> tuple[list[FetchedItem], list[str]]:
     """Stáhne data ze všech povolených zdrojů.
 
@@ -73,6 +76,7 @@ def _fetch_all(
         config: Konfigurace aplikace
         source_filter: Volitelný filtr zdrojů
         fetch_cache: Cache posledního běhu – přeskočí staré články
+        feed_cache: Cache ETag/Last-Modified – nezměněné RSS feedy se neparsují
 
     Returns:
         Tuple (seznam položek, seznam použitých zdrojů)
@@ -81,7 +85,9 @@ def _fetch_all(
     all_items: list[FetchedItem] = []
     sources_used: list[str] = []
 
-    for source_name, fetcher_class in FETCHER_REGISTRY.items():
+    # Výběr povolených zdrojů
+    tasks: list[tuple[str, type, dict]] = []
+    for source_name, fetcher_class in _get_registry().items():
         source_cfg = sources_config.get(source_name, {})
 
         # Kontrola, zda je zdroj povolený
@@ -92,79 +98,117 @@ def _fetch_all(
         if source_filter and source_name not in source_filter:
             continue
 
-        console.print(f"  Stahuji z [bold]{source_name}[/bold]...", end=" ")
-
-        try:
-            fetcher = fetcher_class(source_cfg)
-            items = fetcher.fetch()
-
-            # Filtrování starých článků přes fetch cache
-            if fetch_cache:
-                before = len(items)
-                items = fetch_cache.filter_new_items(items, source_name)
-                skipped = before - len(items)
-                if skipped > 0:
-                    console.print(
-                        f"[green]{len(items)} nových[/green] "
-                        f"[dim](přeskočeno {skipped} starých)[/dim]"
-                    )
+        tasks.append((source_name, fetcher_class, source_cfg))
+
+    if not tasks:
+        return all_items, sources_used
+
+    # Zdroje jsou I/O-bound – stahujeme paralelně, výsledky zpracujeme v hlavním vlákně
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {
+            executor.submit(
+                lambda c=fetcher_class, cfg=source_cfg: c(cfg, feed_cache=feed_cache).fetch()
+            ): source_name
+            for source_name, fetcher_class, source_cfg in tasks
+        }
+
+        for future in as_completed(futures):
+            source_name = futures[future]
+            console.print(f"  Stahuji z [bold]{source_name}[/bold]...", end=" ")
+
+            try:
+                items = future.result()
+
+                # Filtrování starých článků přes fetch cache
+                if fetch_cache:
+                    before = len(items)
+                    items = fetch_cache.filter_new_items(items, source_name)
+                    skipped = before - len(items)
+                    if skipped > 0:
+                        console.print(
+                            f"[green]{len(items)} nových[/green] "
+                            f"[dim](přeskočeno {skipped} starých)[/dim]"
+                        )
+                    else:
+                        console.print(f"[green]{len(items)} položek[/green]")
+                    # Aktualizovat cache timestamp pro tento zdroj
+                    fetch_cache.update(source_name)
                 else:
                     console.print(f"[green]{len(items)} položek[/green]")
-                # Aktualizovat cache timestamp pro tento zdroj
-                fetch_cache.update(source_name)
-            else:
-                console.print(f"[green]{len(items)} položek[/green]")
 
-            all_items.extend(items)
-            sources_used.append(source_name)
-        except Exception as e:
-            console.print(f"[red]CHYBA: {e}[/red]")
-            logging.getLogger(__name__).error("Fetcher %s selhal: %s", source_name, e)
+                all_items.extend(items)
+                sources_used.append(source_name)
+            except Exception as e:
+                console.print(f"[red]CHYBA: {e}[/red]")
+                logging.getLogger(__name__).error("Fetcher %s selhal: %s", source_name, e)
 
     return all_items, sources_used
 
 
 def _process(
-    items: list[FetchedItem], config: dict, keywords: dict
+    items: list[FetchedItem], config: dict, keywords: dict, sources_used: list[str]
 ) -> tuple[list[dict], list[dict]]:
     """Zpracuje stažené položky (extrakce, kategorizace, scoring, clustering).
 
+    Args:
+        sources_used: Zdroje, které mají v items alespoň jednu položku
+
     Returns:
         Tuple (seznam scorovaných topiků, seznam clusterů)
     """
+    from src.processing.categorizer import TopicCategorizer
+    from src.processing.clustering import TopicClusterer
+    from src.processing.extractor import KeywordExtractor
+    from src.processing.item_table import ItemTable
+    from src.processing.scorer import TrendScorer
+
     processing_config = config.get("processing", {})
     scoring_config = config.get("scoring", {})
     categories_config = config.get("categories", {})
+    clustering_enabled = processing_config.get("clustering", {}).get("enabled", True)
+
+    # Sloupcová reprezentace položek a TF-IDF se sestaví jednou – sdílí je všechny kroky
+    table = ItemTable.from_items(items)
+    extractor = KeywordExtractor(processing_config)
+    corpus = extractor.vectorize(table)
 
     # Extrakce klíčových slov
     console.print("  Extrahování klíčových slov...", end=" ")
-    extractor = KeywordExtractor(processing_config)
-    topics = extractor.extract(items)
+    topics = extractor.extract(table, corpus)
     console.print(f"[green]{len(topics)} klíčových slov[/green]")
 
     if not topics:
         return [], []
 
-    # Kategorizace
-    console.print("  Kategorizace topiků...", end=" ")
-    categorizer = TopicCategorizer(keywords, categories_config)
-    topics = categorizer.categorize_batch(topics, items)
-    console.print("[green]hotovo[/green]")
-
-    # Scoring
-    console.print("  Scoring trendů...", end=" ")
-    scorer = TrendScorer(scoring_config)
-    all_sources = {item.source for item in items}
-    topics = scorer.score_batch(topics, items, all_sources)
-    console.print("[green]hotovo[/green]")
-
-    # Clustering
-    clusters: list[dict] = []
-    if processing_config.get("clustering", {}).get("enabled", True):
-        console.print("  Clustering topiků...", end=" ")
-        clusterer = TopicClusterer(processing_config)
-        clusters = clusterer.cluster(items)
-        console.print(f"[green]{len(clusters)} clusterů[/green]")
+    # Clustering závisí jen na items – běží souběžně s kategorizací/scoringem
+    # (spouští se až po extrakci, aby se bez topiků nepočítal zbytečně)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        cluster_future = None
+        if clustering_enabled:
+            # Bez sdílené matice (nebo s nekompatibilní) si clusterer nafituje vlastní TF-IDF
+            cluster_future = executor.submit(
+                TopicClusterer(processing_config).cluster, table, corpus
+            )
+
+        # Kategorizace
+        console.print("  Kategorizace topiků...", end=" ")
+        categorizer = TopicCategorizer(keywords, categories_config)
+        topics = categorizer.categorize_batch(topics, table)
+        console.print("[green]hotovo[/green]")
+
+        # Scoring
+        console.print("  Scoring trendů...", end=" ")
+        scorer = TrendScorer(scoring_config)
+        all_sources = set(sources_used)
+        topics = scorer.score_batch(topics, table, all_sources)
+        console.print("[green]hotovo[/green]")
+
+        # Clustering
+        clusters: list[dict] = []
+        if cluster_future is not None:
+            console.print("  Clustering topiků...", end=" ")
+            clusters = cluster_future.result()
+            console.print(f"[green]{len(clusters)} clusterů[/green]")
 
     return topics, clusters
 
@@ -212,17 +256,24 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
     # Filtr zdrojů
     source_filter = [s.strip() for s in sources.split(",")] if sources else None
 
+    from src.storage.bigquery_dedup import BigQueryDedup
+
     # Kontrola duplicitního spuštění – pokud už byl dnes newsletter odeslán, přeskočit
-    dedup = BigQueryDedup(config)
-    if dedup.enabled and dedup.client and dedup.was_sent_today():
+    # (zároveň se souběžně načtou odeslané hashe pro pozdější deduplikaci)
+    dedup = BigQueryDedup(config, data_dir)
+    dedup_days = config.get("bigquery", {}).get("dedup_days", 7)
+    if dedup.enabled and dedup.client and dedup.prefetch(dedup_days)[0]:
         console.print("[yellow]Newsletter už byl dnes odeslán – přeskakuji.[/yellow]")
         return
 
     # Inicializace fetch cache (přeskakování starých článků)
     fetch_cache = FetchCache(data_dir)
+    feed_cache = FeedCache(data_dir)
 
     console.print("[bold blue]FÁZE 1: Sběr dat[/bold blue]")
-    items, sources_used = _fetch_all(config, source_filter, fetch_cache)
+    items, sources_used = _fetch_all(config, source_filter, fetch_cache, feed_cache)
+    fetch_cache.save()
+    feed_cache.save()
 
     if not items:
         console.print("[red]Žádná data nebyla stažena![/red]")
@@ -230,7 +281,6 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
 
     # Deduplikace – odfiltrování již odeslaných článků
     if dedup.enabled and dedup.client:
-        dedup_days = config.get("bigquery", {}).get("dedup_days", 7)
         original_count = len(items)
         items = dedup.filter_new(items, days=dedup_days)
         console.print(
@@ -244,12 +294,15 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
 
     # Uložení surových dat
     store = DataStore(data_dir)
-    for source_name in sources_used:
-        source_items = [asdict(i) for i in items if i.source == source_name]
+    grouped: dict[str, list[dict]] = {source_name: [] for source_name in sources_used}
+    for item in items:
+        grouped.setdefault(item.source, []).append({n: getattr(item, n) for n in _ITEM_FIELDS})
+    for source_name, source_items in grouped.items():
         store.save_raw(source_items, source_name)
 
     console.print(f"\n[bold blue]FÁZE 2: Zpracování[/bold blue] ({len(items)} položek)")
-    topics, clusters = _process(items, config, keywords)
+    active_sources = [source_name for source_name, rows in grouped.items() if rows]
+    topics, clusters = _process(items, config, keywords, active_sources)
 
     if not topics:
         console.print("[yellow]Žádné topiky nebyly extrahovány[/yellow]")
@@ -259,6 +312,8 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
     store.save_processed(topics)
 
     # Aktualizace historie
+    from src.storage.history import HistoryTracker
+
     history = HistoryTracker(data_dir)
     history.add_run(topics)
 
@@ -274,8 +329,10 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
     # AI sumarizace (pokud je zapnutá)
     newsletter_intro = ""
     if config.get("ai", {}).get("enabled", False):
+        from src.processing.summarizer import TopicSummarizer
+
         console.print(f"\n[bold blue]FÁZE 3: AI sumarizace[/bold blue]")
-        summarizer = TopicSummarizer(config)
+        summarizer = TopicSummarizer(config, data_dir)
 
         # Sestavení categories_map (item index -> categories)
         categories_map: dict[int, list[dict]] = {}
@@ -284,12 +341,9 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
                 if idx not in categories_map:
                     categories_map[idx] = kw_data.get("categories", [])
 
-        console.print("  Generuji AI souhrny clusterů...", end=" ")
-        clusters = summarizer.summarize_all_clusters(clusters, items, categories_map)
-        console.print("[green]hotovo[/green]")
-
-        console.print("  Generuji úvod newsletteru...", end=" ")
-        newsletter_intro = summarizer.generate_newsletter_intro(clusters, metadata)
+        # Souhrny clusterů a úvod newsletteru běží souběžně
+        console.print("  Generuji AI souhrny clusterů a úvod newsletteru...", end=" ")
+        clusters, newsletter_intro = summarizer.run_ai(clusters, items, categories_map, metadata)
         console.print("[green]hotovo[/green]")
 
     # Report
@@ -297,35 +351,48 @@ def scan(ctx: click.Context, sources: str | None, no_report: bool, email: bool,
         phase_num = "4" if config.get("ai", {}).get("enabled", False) else "3"
         console.print(f"\n[bold blue]FÁZE {phase_num}: Report[/bold blue]")
 
-        # Konzolový report
-        reporter = ConsoleReporter(config.get("reporting", {}))
-        reporter.print_report(topics, clusters, metadata)
-
-        # Export
-        export_config = config.get("reporting", {}).get("export", {})
-        exporter = ReportExporter(store)
+        send_email = email or config.get("email", {}).get("enabled", False)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Odeslání emailu (SMTP) běží na pozadí souběžně s konzolovým reportem a exportem
+            email_reporter = EmailReporter(config) if send_email else None
+            email_future = (
+                executor.submit(
+                    email_reporter.send_report, clusters, items, metadata, newsletter_intro
+                )
+                if email_reporter
+                else None
+            )
 
-        if export_config.get("json", True):
-            report_obj = exporter.build_report(topics, clusters, metadata)
-            json_path = exporter.export_json(report_obj)
-            console.print(f"  JSON report: {json_path}")
-
-        if export_config.get("csv", True):
-            csv_path = exporter.export_csv(topics)
-            console.print(f"  CSV report: {csv_path}")
-
-        # Email newsletter
-        if email or config.get("email", {}).get("enabled", False):
-            console.print("  Odesílám newsletter email...", end=" ")
-            email_reporter = EmailReporter(config)
-            if email_reporter.send_report(clusters, items, metadata, newsletter_intro):
-                console.print("[green]odesláno[/green]")
-                # Označit odeslané články v BigQuery
-                if dedup.enabled and dedup.client:
-                    dedup.mark_sent(items, clusters)
-                    console.print("  BigQuery: odeslané články uloženy pro deduplikaci")
-            else:
-                console.print("[red]selhalo (zkontroluj email konfiguraci)[/red]")
+            try:
+                # Konzolový report
+                reporter = ConsoleReporter(config.get("reporting", {}))
+                reporter.print_report(topics, clusters, metadata)
+
+                # Export
+                export_config = config.get("reporting", {}).get("export", {})
+                exporter = ReportExporter(store)
+
+                if export_config.get("json", True):
+                    report_obj = exporter.build_report(topics, clusters, metadata)
+                    json_path = exporter.export_json(report_obj)
+                    console.print(f"  JSON report: {json_path}")
+
+                if export_config.get("csv", True):
+                    csv_path = exporter.export_csv(topics)
+                    console.print(f"  CSV report: {csv_path}")
+            finally:
+                # Email newsletter – i při chybě reportu/exportu se odeslaný email musí
+                # zapsat do deduplikace, jinak by příští běh poslal stejné články znovu
+                if email_future is not None:
+                    console.print("  Odesílám newsletter email...", end=" ")
+                    if email_future.result():
+                        console.print("[green]odesláno[/green]")
+                        # Označit odeslané články v BigQuery
+                        if dedup.enabled and dedup.client:
+                            dedup.mark_sent(items, clusters)
+                            console.print("  BigQuery: odeslané články uloženy pro deduplikaci")
+                    else:
+                        console.print("[red]selhalo (zkontroluj email konfiguraci)[/red]")
 
     console.print(f"\n[bold green]Hotovo![/bold green] ({elapsed:.1f}s)")
 
@@ -366,6 +433,8 @@ def report(ctx: click.Context, fmt: str, top_n: int) -> None:
 @click.pass_context
 def history(ctx: click.Context, days: int) -> None:
     """Zobrazí historické trendy a nové topiky."""
+    from src.storage.history import HistoryTracker
+
     config = load_config(CONFIG_DIR)
     data_dir = PROJECT_ROOT / config["general"]["data_dir"]
     tracker = HistoryTracker(data_dir)
@@ -418,8 +487,22 @@ def config_cmd(ctx: click.Context, show: bool, validate: bool) -> None:
     if show or not validate:
         import yaml
 
+        # libyaml C dumper, pokud je k dispozici
+        try:
+            from yaml import CDumper as Dumper
+        except ImportError:
+            from yaml import Dumper
+
         console.print("[bold]Aktuální konfigurace:[/bold]\n")
-        console.print(yaml.dump(config, default_flow_style=False, allow_unicode=True))
+        console.print(
+            yaml.dump(
+                config,
+                Dumper=Dumper,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+            )
+        )
 
     if validate:
         # Kontrola povinných sekcí
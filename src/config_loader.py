@@ -1,6 +1,9 @@
 """Načtení a validace YAML konfigurace."""
 
+import copy
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 import yaml
@@ -8,6 +11,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# libyaml C parser, pokud je k dispozici
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Výchozí hodnoty konfigurace
 DEFAULTS: dict[str, Any] = {
     "general": {
@@ -55,6 +64,18 @@ def _deep_merge(base: dict, override: dict) -> dict:
     return result
 
 
+@lru_cache(maxsize=4)
+def _cached_yaml(path: str, mtime: float) -> Any:
+    """Načte YAML soubor; cache se invaliduje změnou mtime."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+def _read_yaml(path: Path) -> Any:
+    """Vrátí kopii naparsovaného YAML (volající mohou výsledek měnit)."""
+    return copy.deepcopy(_cached_yaml(str(path), path.stat().st_mtime))
+
+
 def load_config(config_dir: Path) -> dict:
     """Načte hlavní konfiguraci z config.yaml a doplní výchozí hodnoty."""
     config_file = config_dir / "config.yaml"
@@ -62,10 +83,10 @@ def load_config(config_dir: Path) -> dict:
         logger.warning("Konfigurační soubor %s nenalezen, používám výchozí hodnoty", config_file)
         return DEFAULTS.copy()
 
-    with open(config_file, "r", encoding="utf-8") as f:
-        user_config = yaml.safe_load(f) or {}
+    user_config = _read_yaml(config_file) or {}
 
-    config = _deep_merge(DEFAULTS, user_config)
+    # Prázdný config.yaml – merge není potřeba (deepcopy chrání modulové DEFAULTS)
+    config = _deep_merge(DEFAULTS, user_config) if user_config else copy.deepcopy(DEFAULTS)
 
     # Override z environment proměnných (pro Cloud Run)
     env_app_password = os.environ.get("GMAIL_APP_PASSWORD", "")
@@ -84,14 +105,15 @@ def load_keywords(config_dir: Path) -> dict[str, list[str]]:
         logger.warning("Soubor klíčových slov %s nenalezen", keywords_file)
         return {}
 
-    with open(keywords_file, "r", encoding="utf-8") as f:
-        keywords = yaml.safe_load(f) or {}
+    keywords = _read_yaml(keywords_file) or {}
 
-    # Normalizace na lowercase
+    # Normalizace na lowercase + intern (rychlejší porovnávání v kategorizéru)
     normalized: dict[str, list[str]] = {}
     for category, words in keywords.items():
         if isinstance(words, list):
-            normalized[category] = [w.lower().strip() for w in words]
+            normalized[sys.intern(category)] = [
+                sys.intern(w.strip().lower()) for w in words if isinstance(w, str)
+            ]
 
     logger.info("Klíčová slova načtena: %s kategorií", len(normalized))
     return normalized
@@ -2,13 +2,53 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
+from urllib.parse import urlparse
+import asyncio
+import threading
 import time
 import logging
 
+# Výchozí User-Agent pro HTTP requesty
+_USER_AGENT = "LinkedInTopicScanner/0.1"
 
-@dataclass
+# Výchozí timeout a hlavičky pro stahování feedů
+_DEFAULT_TIMEOUT = 15
+_FETCH_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+# Sdílená HTTP session (connection pool) pro všechny fetchery – vytváří se líně
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Token bucket per host – sdílený všemi fetchery (host -> (tokeny, čas poslední aktualizace))
+_HOST_BUCKETS: dict[str, tuple[float, float]] = {}
+_HOST_BUCKETS_LOCK = threading.Lock()
+
+
+def _get_session():
+    """Vrátí sdílenou requests.Session s connection poolingem a retry."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            session.headers["User-Agent"] = _USER_AGENT
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+    return _SESSION
+
+
+@dataclass(slots=True)
 class FetchedItem:
     """Jednotný formát pro položku z libovolného zdroje."""
 
@@ -21,22 +61,69 @@ class FetchedItem:
     score: int = 0              # Upvotes, points
     tags: list[str] = field(default_factory=list)
 
+    @property
+    def published_ts(self) -> Optional[float]:
+        """Unix timestamp z published (naivní datum = UTC), None = bez data."""
+        published = self.published
+        if published is None:
+            return None
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        return published.timestamp()
+
 
 class BaseFetcher(ABC):
     """Bázová třída – každý fetcher musí implementovat fetch() a source_name."""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, feed_cache=None):
         self.config = config
+        # Volitelná FeedCache (ETag / Last-Modified) pro RSS fetchery
+        self.feed_cache = feed_cache
         self.logger = logging.getLogger(self.__class__.__name__)
+        # rate_limit = sekundy mezi requesty; rate_per_sec má přednost, pokud je zadán
         self.rate_limit_seconds: float = config.get("rate_limit", 2.0)
-        self._last_request_time: float = 0.0
-
-    def _rate_limit(self) -> None:
-        """Jednoduchý rate limiter – čeká mezi requesty."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit_seconds:
-            time.sleep(self.rate_limit_seconds - elapsed)
-        self._last_request_time = time.time()
+        default_rate = 1.0 / self.rate_limit_seconds if self.rate_limit_seconds > 0 else 0.0
+        self.rate_per_sec: float = config.get("rate_per_sec", default_rate)
+        self.burst: float = config.get("burst", 1.0)
+
+    @property
+    def session(self):
+        """Sdílená HTTP session – keep-alive spojení napříč dotazy i fetchery."""
+        return _get_session()
+
+    def _fetch_bytes(self, url: str, timeout: float = _DEFAULT_TIMEOUT) -> bytes:
+        """Stáhne tělo odpovědi přes sdílenou session (keep-alive, komprimovaný přenos)."""
+        resp = self.session.get(url, headers=_FETCH_HEADERS, timeout=timeout)
+        resp.raise_for_status()
+        return resp.content
+
+    def _reserve_token(self, url: str) -> float:
+        """Rezervuje token v bucketu hostu. Vrací počet sekund, které je třeba počkat."""
+        if self.rate_per_sec <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc if url else self.source_name
+        with _HOST_BUCKETS_LOCK:
+            now = time.monotonic()
+            tokens, last = _HOST_BUCKETS.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate_per_sec)
+            # Rezervace tokenu – záporný stav = čekání, než se token doplní
+            tokens -= 1.0
+            _HOST_BUCKETS[host] = (tokens, now)
+
+        return -tokens / self.rate_per_sec if tokens < 0 else 0.0
+
+    def _rate_limit(self, url: str = "") -> None:
+        """Token bucket rate limiter per host – dovolí burst, pak čeká na doplnění tokenů."""
+        wait = self._reserve_token(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def _rate_limit_async(self, url: str = "") -> None:
+        """Async varianta _rate_limit – čekání neblokuje ostatní coroutines."""
+        wait = self._reserve_token(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
 
     @abstractmethod
     def fetch(self) -> list[FetchedItem]:
@@ -1,15 +1,40 @@
 """Fetcher pro Google News RSS."""
 
-from datetime import datetime
+import asyncio
+import hashlib
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from urllib.parse import quote_plus
 
 import feedparser
 
-from src.fetchers.base import BaseFetcher, FetchedItem
+from src.fetchers.base import _USER_AGENT, BaseFetcher, FetchedItem
 
-# Šablona URL pro Google News RSS vyhledávání
-_RSS_URL = "https://news.google.com/rss/search?q={query}&hl=en&gl=US&ceid=US:en"
+# aiohttp pro paralelní stahování – bez něj se stahuje sekvenčně přes feedparser
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# URL pro Google News RSS vyhledávání: prefix + dotaz + suffix
+_RSS_PREFIX = "https://news.google.com/rss/search?q="
+_RSS_SUFFIX = "&hl=en&gl=US&ceid=US:en"
+
+# Limity pro paralelní stahování
+_MAX_CONCURRENT = 5
+_TIMEOUT = 15
+
+# Delší URL se v seen setu drží jen jako 16B fingerprint
+_MAX_RAW_URL_LEN = 64
+
+
+def _url_key(link: str) -> str | bytes:
+    """Klíč pro deduplikaci URL – krátké URL beze změny, delší jako blake2b digest."""
+    if len(link) > _MAX_RAW_URL_LEN:
+        return hashlib.blake2b(link.encode("utf-8", "ignore"), digest_size=16).digest()
+    return link
 
 
 class GoogleNewsFetcher(BaseFetcher):
@@ -19,35 +44,80 @@ class GoogleNewsFetcher(BaseFetcher):
     def source_name(self) -> str:
         return "google_news"
 
+    async def _fetch_async(self, queries: list[str]) -> list[bytes | BaseException]:
+        """Stáhne RSS všech dotazů paralelně. Vrací tělo odpovědi nebo výjimku per dotaz."""
+        sem = asyncio.Semaphore(_MAX_CONCURRENT)
+        timeout = aiohttp.ClientTimeout(total=_TIMEOUT)
+
+        async with aiohttp.ClientSession(
+            timeout=timeout, headers={"User-Agent": _USER_AGENT}
+        ) as session:
+
+            async def _get(query: str) -> bytes:
+                url = _RSS_PREFIX + quote_plus(query) + _RSS_SUFFIX
+                self.logger.debug("Stahuji Google News RSS: %s", query)
+                async with sem:
+                    # Stejný token bucket per host jako sekvenční cesta
+                    await self._rate_limit_async(url)
+                    async with session.get(url) as resp:
+                        resp.raise_for_status()
+                        return await resp.read()
+
+            return await asyncio.gather(
+                *(_get(query) for query in queries), return_exceptions=True
+            )
+
+    def _fetch_sequential(self, queries: list[str]) -> list[bytes | BaseException]:
+        """Fallback bez aiohttp – dotazy postupně přes sdílenou session."""
+        results: list[bytes | BaseException] = []
+        for query in queries:
+            url = _RSS_PREFIX + quote_plus(query) + _RSS_SUFFIX
+            self._rate_limit(url)
+            self.logger.debug("Stahuji Google News RSS: %s", query)
+            try:
+                results.append(self._fetch_bytes(url, timeout=_TIMEOUT))
+            except Exception as e:
+                results.append(e)
+        return results
+
     def fetch(self) -> list[FetchedItem]:
         queries: list[str] = self.config.get("queries", [])
         if not queries:
             self.logger.warning("Žádné vyhledávací dotazy nakonfigurovány")
             return []
 
-        seen_urls: set[str] = set()
+        if AIOHTTP_AVAILABLE:
+            results = asyncio.run(self._fetch_async(queries))
+        else:
+            results = self._fetch_sequential(queries)
+
+        seen_urls: set[str | bytes] = set()
         items: list[FetchedItem] = []
 
-        for query in queries:
-            self._rate_limit()
-            url = _RSS_URL.format(query=quote_plus(query))
-            self.logger.debug("Stahuji Google News RSS: %s", query)
+        for query, result in zip(queries, results):
+            if isinstance(result, BaseException):
+                self.logger.error("Chyba při stahování RSS pro '%s': %s", query, result)
+                continue
 
             try:
-                feed = feedparser.parse(url)
+                feed = feedparser.parse(result)
             except Exception as e:
                 self.logger.error("Chyba při parsování RSS pro '%s': %s", query, e)
                 continue
 
             for entry in feed.entries:
                 link = getattr(entry, "link", "")
-                if link in seen_urls:
+                key = _url_key(link)
+                if key in seen_urls:
                     continue
-                seen_urls.add(link)
+                seen_urls.add(key)
 
-                # Parsování data publikace
+                # Datum publikace – feedparser ho už naparsoval (UTC struct_time)
                 published = None
-                if hasattr(entry, "published"):
+                published_parsed = getattr(entry, "published_parsed", None)
+                if published_parsed:
+                    published = datetime(*published_parsed[:6], tzinfo=timezone.utc)
+                elif hasattr(entry, "published"):
                     try:
                         published = parsedate_to_datetime(entry.published)
                     except Exception:
@@ -1,6 +1,7 @@
 """Fetcher pro Google Trends (pytrends). Celý modul je zabalený v try/except."""
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import quote_plus
 
 from src.fetchers.base import BaseFetcher, FetchedItem
@@ -13,6 +14,24 @@ try:
 except ImportError:
     PYTRENDS_AVAILABLE = False
 
+# Host pro rate limiting (pytrends si URL sestavuje sám)
+_TRENDS_URL = "https://trends.google.com"
+
+
+@lru_cache(maxsize=4)
+def _get_trendreq(hl: str, tz: int) -> "TrendReq":
+    """Vrátí sdílený TrendReq klient (cookie bootstrap proběhne jen jednou)."""
+    return TrendReq(hl=hl, tz=tz)
+
+
+def _query_value_pairs(df, limit: int = 10):
+    """Vrátí dvojice (query, value) z prvních N řádků – iterace přes sloupce, ne iterrows."""
+    head = df.head(limit)
+    n = len(head)
+    queries = head["query"].to_numpy(dtype=object) if "query" in head.columns else [""] * n
+    values = head["value"].to_numpy() if "value" in head.columns else [0] * n
+    return zip(queries, values)
+
 
 class GoogleTrendsFetcher(BaseFetcher):
     """Stahuje trending data z Google Trends. Pokud pytrends selže, vrací prázdný seznam."""
@@ -32,14 +51,20 @@ class GoogleTrendsFetcher(BaseFetcher):
         items: list[FetchedItem] = []
         now = datetime.now(tz=timezone.utc)
 
+        # Jeden klient pro trending i related queries
+        try:
+            pytrends = _get_trendreq("en-US", 360)
+        except Exception as e:
+            self.logger.warning("Google Trends inicializace selhala: %s", e)
+            return []
+
         # Trending vyhledávání
         try:
-            self._rate_limit()
-            pytrends = TrendReq(hl="en-US", tz=360)
+            self._rate_limit(_TRENDS_URL)
             trending_df = pytrends.trending_searches(pn="united_states")
 
-            for _, row in trending_df.iterrows():
-                keyword = str(row.iloc[0])
+            for keyword in trending_df.iloc[:, 0].to_numpy(dtype=object):
+                keyword = str(keyword)
                 items.append(
                     FetchedItem(
                         title=keyword,
@@ -56,8 +81,7 @@ class GoogleTrendsFetcher(BaseFetcher):
         # Related queries pro každou skupinu klíčových slov
         for group in keyword_groups:
             try:
-                self._rate_limit()
-                pytrends = TrendReq(hl="en-US", tz=360)
+                self._rate_limit(_TRENDS_URL)
                 pytrends.build_payload(group, timeframe="now 7-d", geo=geo)
 
                 related = pytrends.related_queries()
@@ -68,9 +92,8 @@ class GoogleTrendsFetcher(BaseFetcher):
                     # Top related queries
                     top_df = data.get("top")
                     if top_df is not None and not top_df.empty:
-                        for _, row in top_df.head(10).iterrows():
-                            query_text = str(row.get("query", ""))
-                            value = int(row.get("value", 0))
+                        for query, value in _query_value_pairs(top_df):
+                            query_text = str(query)
                             items.append(
                                 FetchedItem(
                                     title=query_text,
@@ -79,16 +102,15 @@ class GoogleTrendsFetcher(BaseFetcher):
                                     source=self.source_name,
                                     source_detail=f"related_top:{kw}",
                                     published=now,
-                                    score=value,
+                                    score=int(value),
                                 )
                             )
 
                     # Rising related queries
                     rising_df = data.get("rising")
                     if rising_df is not None and not rising_df.empty:
-                        for _, row in rising_df.head(10).iterrows():
-                            query_text = str(row.get("query", ""))
-                            value = int(row.get("value", 0))
+                        for query, value in _query_value_pairs(rising_df):
+                            query_text = str(query)
                             items.append(
                                 FetchedItem(
                                     title=query_text,
@@ -97,7 +119,7 @@ class GoogleTrendsFetcher(BaseFetcher):
                                     source=self.source_name,
                                     source_detail=f"related_rising:{kw}",
                                     published=now,
-                                    score=value,
+                                    score=int(value),
                                     tags=["rising"],
                                 )
                             )
@@ -1,16 +1,58 @@
 """Fetcher pro HackerNews API (Firebase)."""
 
+import asyncio
+import json
+import re
+import time
 from datetime import datetime, timezone
+from typing import Optional
 
-import requests
+from src.fetchers.base import _USER_AGENT, BaseFetcher, FetchedItem
 
-from src.fetchers.base import BaseFetcher, FetchedItem
+# aiohttp pro paralelní stahování stories – bez něj se stahuje sekvenčně
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# orjson pro rychlejší dekódování stovek malých JSON odpovědí – bez něj standardní json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 _BASE_URL = "https://hacker-news.firebaseio.com/v0"
 _TOP_STORIES_URL = f"{_BASE_URL}/topstories.json"
 _ITEM_URL = f"{_BASE_URL}/item/{{id}}.json"
 _TIMEOUT = 10
 
+# Algolia HN Search API – stories i s metadaty jedním requestem (max 1000 na stránku).
+# /search řadí podle relevance vůči dotazu, ne podle HN žebříčku – proto jen volitelně
+_ALGOLIA_URL = "https://hn.algolia.com/api/v1/search"
+_ALGOLIA_MAX_HITS = 1000
+
+# Maximální počet souběžných requestů na Firebase API
+_MAX_CONCURRENT = 64
+
+
+def _json_loads(data: bytes):
+    """Dekóduje JSON tělo odpovědi (orjson, pokud je dostupný)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _keyword_pattern(keywords: list[str]) -> Optional[re.Pattern]:
+    """Zkompiluje klíčová slova do jedné alternace – titulek se prohledá jedním průchodem."""
+    keywords = [kw.lower() for kw in keywords if kw]
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)))
+
 
 class HackerNewsFetcher(BaseFetcher):
     """Stahuje top stories z HackerNews a filtruje dle relevance."""
@@ -19,64 +61,157 @@ class HackerNewsFetcher(BaseFetcher):
     def source_name(self) -> str:
         return "hackernews"
 
-    def _is_relevant(self, title: str, keywords: list[str]) -> bool:
-        """Kontroluje, zda titulek obsahuje alespoň jedno klíčové slovo."""
-        title_lower = title.lower()
-        return any(kw.lower() in title_lower for kw in keywords)
+    def _is_relevant(self, title_lower: str, pattern: re.Pattern) -> bool:
+        """Kontroluje, zda (lowercase) titulek obsahuje alespoň jedno klíčové slovo."""
+        return pattern.search(title_lower) is not None
+
+    def _build_item(
+        self, story_id: int, story: Optional[dict], pattern: Optional[re.Pattern]
+    ) -> Optional[FetchedItem]:
+        """Převede HN story na FetchedItem. Vrací None pro nerelevantní položky."""
+        if not story or story.get("type") != "story":
+            return None
+
+        title = story.get("title", "")
+
+        # Filtrování dle relevance (pokud jsou klíčová slova nastavena)
+        if pattern is not None and not self._is_relevant(title.lower(), pattern):
+            return None
+
+        # Převod Unix timestamp na datetime
+        published = None
+        if "time" in story:
+            published = datetime.fromtimestamp(story["time"], tz=timezone.utc)
+
+        return FetchedItem(
+            title=title,
+            description="",
+            url=story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
+            source=self.source_name,
+            source_detail="hackernews",
+            published=published,
+            score=story.get("score", 0),
+        )
+
+    async def _get_json(self, session, sem: asyncio.Semaphore, url: str):
+        """Stáhne JSON z HN API s omezením souběžnosti a rate limitem."""
+        async with sem:
+            await self._rate_limit_async(url)
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                return _json_loads(await resp.read())
+
+    async def _fetch_async(self, max_stories: int) -> tuple[list[int], list]:
+        """Stáhne seznam top stories a všechny stories paralelně."""
+        sem = asyncio.Semaphore(_MAX_CONCURRENT)
+        connector = aiohttp.TCPConnector(limit=_MAX_CONCURRENT)
+        timeout = aiohttp.ClientTimeout(total=_TIMEOUT)
+
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers={"User-Agent": _USER_AGENT}
+        ) as session:
+            story_ids: list[int] = (await self._get_json(session, sem, _TOP_STORIES_URL))[:max_stories]
+            stories = await asyncio.gather(
+                *(
+                    self._get_json(session, sem, _ITEM_URL.format(id=story_id))
+                    for story_id in story_ids
+                ),
+                return_exceptions=True,
+            )
+        return story_ids, stories
+
+    def _fetch_algolia(self, max_stories: int, lookback_hours: float) -> tuple[list[int], list]:
+        """Stáhne až max_stories stories za posledních N hodin jedním requestem na Algolia API.
+
+        Pořadí a výběr určuje relevance Algolia /search (s prázdným dotazem), ne žebříček
+        topstories – výsledek tedy nejsou "nejlepší" stories jako z Firebase. Hity převádí
+        do tvaru Firebase item, aby šly zpracovat stejně jako z fan-outu.
+        """
+        since = int(time.time() - lookback_hours * 3600)
+        params = {
+            "tags": "story",
+            "numericFilters": f"created_at_i>{since}",
+            "hitsPerPage": min(max_stories, _ALGOLIA_MAX_HITS),
+        }
+        self._rate_limit(_ALGOLIA_URL)
+        resp = self.session.get(_ALGOLIA_URL, params=params, timeout=_TIMEOUT)
+        resp.raise_for_status()
+
+        story_ids: list[int] = []
+        stories: list = []
+        for hit in _json_loads(resp.content).get("hits", []):
+            story = {
+                "type": "story",
+                "title": hit.get("title") or "",
+                "score": hit.get("points") or 0,
+                "time": hit.get("created_at_i"),
+            }
+            # Ask/Show HN nemají externí URL – _build_item doplní odkaz na diskusi
+            if hit.get("url"):
+                story["url"] = hit["url"]
+            if story["time"] is None:
+                del story["time"]
+            story_ids.append(int(hit["objectID"]))
+            stories.append(story)
+        return story_ids, stories
+
+    def _fetch_sequential(self, max_stories: int) -> tuple[list[int], list]:
+        """Fallback bez aiohttp – stories postupně přes sdílenou keep-alive session."""
+        resp = self.session.get(_TOP_STORIES_URL, timeout=_TIMEOUT)
+        resp.raise_for_status()
+        story_ids: list[int] = _json_loads(resp.content)[:max_stories]
+
+        stories: list = []
+        for story_id in story_ids:
+            item_url = _ITEM_URL.format(id=story_id)
+            self._rate_limit(item_url)
+
+            try:
+                resp = self.session.get(item_url, timeout=_TIMEOUT)
+                resp.raise_for_status()
+                stories.append(_json_loads(resp.content))
+            except Exception as e:
+                stories.append(e)
+        return story_ids, stories
 
     def fetch(self) -> list[FetchedItem]:
         max_stories: int = self.config.get("max_stories", 200)
         keywords: list[str] = self.config.get("relevance_keywords", [])
-
-        # Stažení seznamu top story IDs
-        try:
-            resp = requests.get(_TOP_STORIES_URL, timeout=_TIMEOUT)
-            resp.raise_for_status()
-            story_ids: list[int] = resp.json()[:max_stories]
-        except Exception as e:
-            self.logger.error("Chyba při stahování HN top stories: %s", e)
-            return []
-
-        items: list[FetchedItem] = []
-
-        for story_id in story_ids:
-            self._rate_limit()
-
+        # Algolia je opt-in – výchozí zdroj je žebříček topstories z Firebase
+        use_algolia: bool = self.config.get("use_algolia", False)
+        lookback_hours: float = self.config.get("lookback_hours", 48)
+
+        # Volitelně jeden bulk request na Algolia, při chybě fan-out přes Firebase API
+        story_ids: list[int] = []
+        stories: list = []
+        if use_algolia:
             try:
-                resp = requests.get(
-                    _ITEM_URL.format(id=story_id), timeout=_TIMEOUT
-                )
-                resp.raise_for_status()
-                story = resp.json()
+                story_ids, stories = self._fetch_algolia(max_stories, lookback_hours)
             except Exception as e:
-                self.logger.debug("Chyba při stahování HN story %d: %s", story_id, e)
-                continue
+                self.logger.warning("Algolia HN API selhalo, fallback na Firebase: %s", e)
 
-            if not story or story.get("type") != "story":
-                continue
+        # Stažení seznamu top story IDs a samotných stories (fan-out přes Firebase)
+        if not story_ids:
+            try:
+                if AIOHTTP_AVAILABLE:
+                    story_ids, stories = asyncio.run(self._fetch_async(max_stories))
+                else:
+                    story_ids, stories = self._fetch_sequential(max_stories)
+            except Exception as e:
+                self.logger.error("Chyba při stahování HN top stories: %s", e)
+                return []
 
-            title = story.get("title", "")
+        pattern = _keyword_pattern(keywords)
+        items: list[FetchedItem] = []
 
-            # Filtrování dle relevance (pokud jsou klíčová slova nastavena)
-            if keywords and not self._is_relevant(title, keywords):
+        for story_id, story in zip(story_ids, stories):
+            if isinstance(story, BaseException):
+                self.logger.debug("Chyba při stahování HN story %d: %s", story_id, story)
                 continue
 
-            # Převod Unix timestamp na datetime
-            published = None
-            if "time" in story:
-                published = datetime.fromtimestamp(story["time"], tz=timezone.utc)
-
-            items.append(
-                FetchedItem(
-                    title=title,
-                    description="",
-                    url=story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
-                    source=self.source_name,
-                    source_detail="hackernews",
-                    published=published,
-                    score=story.get("score", 0),
-                )
-            )
+            item = self._build_item(story_id, story, pattern)
+            if item is not None:
+                items.append(item)
 
         self.logger.info("HackerNews: staženo %d relevantních položek z %d stories", len(items), len(story_ids))
         return items
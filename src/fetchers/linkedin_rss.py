@@ -1,11 +1,13 @@
 """Fetcher pro LinkedIn Newsletter RSS (experimentální)."""
 
-from datetime import datetime
-from email.utils import parsedate_to_datetime
-
-import feedparser
+from concurrent.futures import ThreadPoolExecutor
 
 from src.fetchers.base import BaseFetcher, FetchedItem
+from src.fetchers.rss import fetch_feed, new_entries
+
+# Maximální počet paralelně stahovaných feedů
+_MAX_WORKERS = 8
+_TIMEOUT = 15
 
 
 class LinkedInRSSFetcher(BaseFetcher):
@@ -15,6 +17,15 @@ class LinkedInRSSFetcher(BaseFetcher):
     def source_name(self) -> str:
         return "linkedin_rss"
 
+    def _parse_feed(self, feed_url: str):
+        """Stáhne a rozparsuje jeden feed. Při chybě vrací výjimku místo vyhození."""
+        self._rate_limit(feed_url)
+        self.logger.debug("Stahuji LinkedIn RSS: %s", feed_url)
+        try:
+            return fetch_feed(self.session, feed_url, self.feed_cache, timeout=_TIMEOUT)
+        except Exception as e:
+            return e
+
     def fetch(self) -> list[FetchedItem]:
         urls: list[str] = self.config.get("newsletter_urls", [])
 
@@ -25,39 +36,28 @@ class LinkedInRSSFetcher(BaseFetcher):
         items: list[FetchedItem] = []
         seen_urls: set[str] = set()
 
-        for feed_url in urls:
-            self._rate_limit()
-            self.logger.debug("Stahuji LinkedIn RSS: %s", feed_url)
+        # Feedy jsou I/O-bound – stahujeme je paralelně
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(urls))) as executor:
+            feeds = list(executor.map(self._parse_feed, urls))
 
-            try:
-                feed = feedparser.parse(feed_url)
-            except Exception as e:
-                self.logger.error("Chyba při parsování LinkedIn RSS %s: %s", feed_url, e)
+        for feed_url, feed in zip(urls, feeds):
+            if isinstance(feed, Exception):
+                self.logger.error("Chyba při parsování LinkedIn RSS %s: %s", feed_url, feed)
                 continue
 
-            feed_title = getattr(feed.feed, "title", feed_url)
-
-            for entry in feed.entries:
-                link = getattr(entry, "link", "")
-                if link in seen_urls:
-                    continue
-                seen_urls.add(link)
-
-                published = None
-                if hasattr(entry, "published"):
-                    try:
-                        published = parsedate_to_datetime(entry.published)
-                    except Exception:
-                        pass
+            feed_title, entries = feed
+            feed_title = feed_title or feed_url
 
+            # Deduplikace přes kanonickou URL napříč všemi feedy
+            for entry in new_entries(entries, seen_urls):
                 items.append(
                     FetchedItem(
-                        title=getattr(entry, "title", ""),
-                        description=getattr(entry, "summary", ""),
-                        url=link,
+                        title=entry["title"],
+                        description=entry["summary"],
+                        url=entry["link"],
                         source=self.source_name,
                         source_detail=feed_title,
-                        published=published,
+                        published=entry["published"],
                     )
                 )
 
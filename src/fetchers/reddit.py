@@ -1,17 +1,16 @@
 """Fetcher pro Reddit RSS feedy."""
 
-from datetime import datetime
-from email.utils import parsedate_to_datetime
-
-import feedparser
+from concurrent.futures import ThreadPoolExecutor
 
 from src.fetchers.base import BaseFetcher, FetchedItem
+from src.fetchers.rss import fetch_feed, new_entries
 
 # Šablona URL pro Reddit RSS
 _RSS_URL = "https://www.reddit.com/r/{subreddit}/{sort}/.rss?t={time_filter}&limit={limit}"
 
-# User-Agent pro Reddit (vyžadují neprázdný)
-_USER_AGENT = "LinkedInTopicScanner/0.1"
+# Maximální počet paralelně stahovaných feedů
+_MAX_WORKERS = 8
+_TIMEOUT = 15
 
 
 class RedditFetcher(BaseFetcher):
@@ -21,6 +20,16 @@ class RedditFetcher(BaseFetcher):
     def source_name(self) -> str:
         return "reddit"
 
+    def _parse_feed(self, url: str):
+        """Stáhne a rozparsuje jeden feed. Při chybě vrací výjimku místo vyhození."""
+        self._rate_limit(url)
+        self.logger.debug("Stahuji Reddit RSS: %s", url)
+        try:
+            # User-Agent (Reddit vyžaduje neprázdný) nastavuje sdílená session
+            return fetch_feed(self.session, url, self.feed_cache, timeout=_TIMEOUT)
+        except Exception as e:
+            return e
+
     def fetch(self) -> list[FetchedItem]:
         subreddits: list[str] = self.config.get("subreddits", [])
         sort = self.config.get("sort", "top")
@@ -34,47 +43,37 @@ class RedditFetcher(BaseFetcher):
         items: list[FetchedItem] = []
         seen_urls: set[str] = set()
 
-        for subreddit in subreddits:
-            self._rate_limit()
-            url = _RSS_URL.format(
+        urls = [
+            _RSS_URL.format(
                 subreddit=subreddit,
                 sort=sort,
                 time_filter=time_filter,
                 limit=limit,
             )
-            self.logger.debug("Stahuji Reddit RSS: r/%s", subreddit)
-
-            try:
-                feed = feedparser.parse(url, agent=_USER_AGENT)
-            except Exception as e:
-                self.logger.error("Chyba při stahování r/%s: %s", subreddit, e)
-                continue
-
-            for entry in feed.entries:
-                link = getattr(entry, "link", "")
-                if link in seen_urls:
-                    continue
-                seen_urls.add(link)
+            for subreddit in subreddits
+        ]
 
-                # Parsování data
-                published = None
-                if hasattr(entry, "published"):
-                    try:
-                        published = parsedate_to_datetime(entry.published)
-                    except Exception:
-                        pass
+        # Feedy jsou I/O-bound – stahujeme je paralelně
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(urls))) as executor:
+            feeds = list(executor.map(self._parse_feed, urls))
 
-                # Popis (Reddit RSS dává HTML content)
-                description = getattr(entry, "summary", "")
+        for subreddit, feed in zip(subreddits, feeds):
+            if isinstance(feed, Exception):
+                self.logger.error("Chyba při stahování r/%s: %s", subreddit, feed)
+                continue
 
+            _, entries = feed
+            # Deduplikace přes kanonickou URL napříč všemi feedy
+            for entry in new_entries(entries, seen_urls):
                 items.append(
                     FetchedItem(
-                        title=getattr(entry, "title", ""),
-                        description=description,
-                        url=link,
+                        title=entry["title"],
+                        # Popis (Reddit RSS dává HTML content)
+                        description=entry["summary"],
+                        url=entry["link"],
                         source=self.source_name,
                         source_detail=f"r/{subreddit}",
-                        published=published,
+                        published=entry["published"],
                     )
                 )
 
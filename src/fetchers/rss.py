@@ -0,0 +1,224 @@
+"""Rychlé streamové parsování RSS/Atom feedů (lxml) s fallbackem na feedparser."""
+
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import feedparser
+
+from src.fetchers.base import _DEFAULT_TIMEOUT, _FETCH_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# lxml iterparse – bez něj (nebo při nevalidním XML) se použije feedparser
+try:
+    from lxml import etree
+
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"         # RSS 1.0 (RDF)
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"    # content:encoded
+_ENTRY_TAGS = ("item", f"{_RSS1}item", f"{_ATOM}entry")
+_FEED_TITLE_PARENTS = ("channel", f"{_RSS1}channel", f"{_ATOM}feed")
+_TITLE_TAGS = ("title", f"{_RSS1}title", f"{_ATOM}title")
+
+# Query parametry, které článek neidentifikují (tracking) – při deduplikaci se zahodí
+_TRACKING_PARAMS = frozenset({
+    "ref", "ref_src", "ref_url", "share_id", "fbclid", "gclid",
+    "igshid", "mc_cid", "mc_eid", "cmpid", "smid",
+})
+
+
+def _parse_date(text: Optional[str]) -> Optional[datetime]:
+    """Parsuje RFC 2822 (RSS pubDate) i ISO 8601 (Atom) datum."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        return parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        pass
+    try:
+        published = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+
+def _child_text(el, *tags: str) -> str:
+    """Vrátí text prvního nalezeného potomka z tags."""
+    for tag in tags:
+        child = el.find(tag)
+        if child is not None and child.text:
+            return child.text.strip()
+    return ""
+
+
+def _atom_link(el) -> str:
+    """Vrátí href alternate odkazu z Atom entry (nebo prvního odkazu)."""
+    links = el.findall(f"{_ATOM}link")
+    for link in links:
+        if link.get("rel", "alternate") == "alternate":
+            return link.get("href", "")
+    return links[0].get("href", "") if links else ""
+
+
+def _entry_to_dict(el) -> dict:
+    """Převede <item>/<entry> element na jednotný slovník."""
+    if el.tag == "item":
+        return {
+            "title": _child_text(el, "title"),
+            "link": _child_text(el, "link"),
+            "summary": _child_text(el, "description", f"{_CONTENT}encoded"),
+            "published": _parse_date(_child_text(el, "pubDate", f"{_DC}date")),
+        }
+    if el.tag == f"{_RSS1}item":
+        return {
+            "title": _child_text(el, f"{_RSS1}title"),
+            "link": _child_text(el, f"{_RSS1}link"),
+            "summary": _child_text(el, f"{_RSS1}description", f"{_CONTENT}encoded"),
+            "published": _parse_date(_child_text(el, f"{_DC}date")),
+        }
+    return {
+        "title": _child_text(el, f"{_ATOM}title"),
+        "link": _atom_link(el),
+        "summary": _child_text(el, f"{_ATOM}summary", f"{_ATOM}content"),
+        "published": _parse_date(_child_text(el, f"{_ATOM}published", f"{_ATOM}updated")),
+    }
+
+
+def _parse_lxml(data: bytes) -> tuple[str, list[dict]]:
+    """Streamové parsování – po zpracování se elementy uvolňují, paměť zůstává konstantní."""
+    feed_title = ""
+    entries: list[dict] = []
+
+    for _, el in etree.iterparse(
+        BytesIO(data), events=("end",), tag=_ENTRY_TAGS + _TITLE_TAGS
+    ):
+        if el.tag in _TITLE_TAGS:
+            parent = el.getparent()
+            if not feed_title and parent is not None and parent.tag in _FEED_TITLE_PARENTS:
+                feed_title = (el.text or "").strip()
+            continue
+
+        entries.append(_entry_to_dict(el))
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+    return feed_title, entries
+
+
+def _parse_feedparser(data: bytes) -> tuple[str, list[dict]]:
+    """Fallback přes feedparser – stejný výstup jako _parse_lxml."""
+    feed = feedparser.parse(data)
+    entries = []
+    for entry in feed.entries:
+        entries.append(
+            {
+                "title": getattr(entry, "title", ""),
+                "link": getattr(entry, "link", ""),
+                "summary": getattr(entry, "summary", ""),
+                "published": _parse_date(getattr(entry, "published", None)),
+            }
+        )
+    return getattr(feed.feed, "title", ""), entries
+
+
+def _is_tracking_param(param: str) -> bool:
+    name = param.split("=", 1)[0].lower()
+    return name.startswith("utm_") or name in _TRACKING_PARAMS
+
+
+def canonical_url(url: str) -> str:
+    """Normalizuje URL pro deduplikaci.
+
+    Malá písmena jen ve schématu a hostu (cesta a query rozlišují velikost),
+    bez fragmentu, koncového lomítka a tracking parametrů (utm_*, ref, ...).
+    Ostatní query parametry zůstávají – mohou identifikovat článek (?id=1).
+    """
+    parts = urlsplit(url.strip())
+    query = parts.query
+    if query:
+        query = "&".join(p for p in query.split("&") if p and not _is_tracking_param(p))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, "")
+    )
+
+
+def new_entries(entries: list[dict], seen_urls: set[str]) -> list[dict]:
+    """Vrátí entries, jejichž kanonická URL ještě nebyla viděna, a přidá je do seen_urls."""
+    by_canon: dict[str, dict] = {}
+    for entry in entries:
+        by_canon.setdefault(canonical_url(entry["link"]), entry)
+
+    fresh = [entry for canon, entry in by_canon.items() if canon not in seen_urls]
+    seen_urls.update(by_canon)
+    return fresh
+
+
+def parse_feed(data: bytes) -> tuple[str, list[dict]]:
+    """Rozparsuje RSS/Atom feed.
+
+    Returns:
+        Tuple (název feedu, seznam entries [{"title", "link", "summary", "published"}])
+    """
+    if LXML_AVAILABLE:
+        try:
+            feed_title, entries = _parse_lxml(data)
+        except etree.XMLSyntaxError as e:
+            logger.debug("lxml parsování selhalo, fallback na feedparser: %s", e)
+        else:
+            # Validní XML bez rozpoznaných entries (jiný namespace / formát) – zkusí feedparser
+            if entries or not data.strip():
+                return feed_title, entries
+            logger.debug("lxml nenašel žádné entries, fallback na feedparser")
+    return _parse_feedparser(data)
+
+
+def fetch_feed(
+    session, url: str, feed_cache=None, timeout: float = _DEFAULT_TIMEOUT
+) -> tuple[str, list[dict]]:
+    """Stáhne a rozparsuje feed podmíněným requestem (ETag / Last-Modified).
+
+    Args:
+        session: HTTP session (sdílená requests.Session)
+        feed_cache: Volitelná FeedCache – na 304 Not Modified vrací entries z ní
+
+    Returns:
+        Tuple (název feedu, seznam entries) – stejně jako parse_feed
+    """
+    cached = feed_cache.get(url) if feed_cache is not None else None
+
+    headers = dict(_FETCH_HEADERS)
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = session.get(url, headers=headers, timeout=timeout)
+    if cached and resp.status_code == 304:
+        logger.debug("Feed beze změny (304), používám cache: %s", url)
+        return cached["feed_title"], cached["entries"]
+    resp.raise_for_status()
+
+    feed_title, entries = parse_feed(resp.content)
+    if feed_cache is not None:
+        feed_cache.put(
+            url,
+            resp.headers.get("ETag"),
+            resp.headers.get("Last-Modified"),
+            feed_title,
+            entries,
+        )
+    return feed_title, entries
@@ -2,8 +2,18 @@
 
 import logging
 
+from src.processing.item_table import ItemTable, as_table
+
 logger = logging.getLogger(__name__)
 
+# Aho-Corasick automat pro vyhledání všech slov ze slovníku jedním průchodem textu
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 class TopicCategorizer:
     """Řadí klíčová slova do kategorií na základě slovníků."""
@@ -17,6 +27,38 @@ class TopicCategorizer:
         self.keywords = keywords
         self.categories_config = categories_config
 
+        # Index slov: word -> [(kategorie, první pozice ve slovníku, počet výskytů ve slovníku)]
+        # Prázdná slova se vynechávají – jako podřetězec by sedla na každý text
+        self._word_index: dict[str, list[tuple[str, int, int]]] = {}
+        for category, word_list in keywords.items():
+            positions: dict[str, list[int]] = {}
+            for pos, word in enumerate(word_list):
+                if not word:
+                    logger.warning("Prázdné slovo ve slovníku kategorie %s – přeskočeno", category)
+                    continue
+                positions.setdefault(word, []).append(pos)
+            for word, pos_list in positions.items():
+                self._word_index.setdefault(word, []).append((category, pos_list[0], len(pos_list)))
+
+        # Nejdelší slovo per kategorie – delší klíčové slovo nemůže být podřetězcem žádného
+        self._max_word_len: dict[str, int] = {
+            category: max(map(len, word_list), default=0)
+            for category, word_list in keywords.items()
+        }
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._word_index:
+            self._automaton = ahocorasick.Automaton()
+            for word in self._word_index:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+
+    def _find_words(self, text: str) -> set[str]:
+        """Vrátí všechna slova ze slovníků, která jsou podřetězcem textu."""
+        if self._automaton is not None:
+            return {word for _, word in self._automaton.iter(text)}
+        return {word for word in self._word_index if word in text}
+
     def categorize(self, keyword: str, context: str = "") -> list[dict]:
         """Vrací seznam kategorií s confidence score.
 
@@ -27,30 +69,55 @@ class TopicCategorizer:
         Returns:
             Seznam: [{"category": str, "display_name": str, "confidence": float}]
         """
-        keyword_lower = keyword.lower().strip()
-        context_lower = context.lower()
+        context_words = self._find_words(context.lower()) if context else set()
+        return self._categorize_lower(keyword.lower().strip(), context_words)
+
+    def _categorize_lower(self, keyword_lower: str, context_words: set[str]) -> list[dict]:
+        """Jádro categorize() – očekává lowercase klíčové slovo a slova slovníku nalezená v kontextu."""
         results = []
 
+        # Jeden průchod klíčovým slovem a jeden kontextem pro všechny kategorie
+        exact_categories = {cat for cat, _, _ in self._word_index.get(keyword_lower, [])}
+
+        first_in_keyword: dict[str, int] = {}
+        for word in self._find_words(keyword_lower):
+            if word == keyword_lower:
+                continue
+            for cat, pos, _ in self._word_index[word]:
+                if pos < first_in_keyword.get(cat, pos + 1):
+                    first_in_keyword[cat] = pos
+
+        context_counts: dict[str, int] = {}
+        for word in context_words:
+            for cat, _, count in self._word_index[word]:
+                context_counts[cat] = context_counts.get(cat, 0) + count
+
         for category, word_list in self.keywords.items():
             confidence = 0.0
 
             # Přesná shoda klíčového slova se slovníkem
-            if keyword_lower in word_list:
+            if category in exact_categories:
                 confidence += 0.8
 
-            # Částečná shoda – klíčové slovo je podřetězcem slova ze slovníku nebo naopak
-            for word in word_list:
-                if word in keyword_lower and word != keyword_lower:
-                    confidence += 0.4
-                    break
+            # Částečná shoda – rozhoduje první slovo ve slovníku, které je podřetězcem
+            # klíčového slova (+0.4) nebo naopak (+0.3); druhý směr stačí hledat před ním
+            first_pos = first_in_keyword.get(category)
+            if first_pos is None and len(keyword_lower) >= self._max_word_len[category]:
+                candidates = ()
+            else:
+                candidates = word_list if first_pos is None else word_list[:first_pos]
+            for word in candidates:
                 if keyword_lower in word and word != keyword_lower:
                     confidence += 0.3
                     break
+            else:
+                if first_pos is not None:
+                    confidence += 0.4
 
             # Kontrola kontextu – kolik slov ze slovníku se vyskytuje v kontextu
-            if context_lower:
-                context_matches = sum(1 for w in word_list if w in context_lower)
-                context_score = min(context_matches * 0.1, 0.5)
+            # (při confidence >= 1.0 už nic nezmění, výsledek se ořezává)
+            if context_counts and confidence < 1.0:
+                context_score = min(context_counts.get(category, 0) * 0.1, 0.5)
                 confidence += context_score
 
             # Minimální práh pro zařazení
@@ -82,29 +149,33 @@ class TopicCategorizer:
         return results
 
     def categorize_batch(
-        self, keywords_data: list[dict], items: list
+        self, keywords_data: list[dict], items: ItemTable | list
     ) -> list[dict]:
         """Kategorizuje seznam klíčových slov najednou.
 
         Args:
             keywords_data: Seznam z extractoru [{"keyword": str, "source_items": list[int], ...}]
-            items: Původní FetchedItem seznam (pro kontext)
+            items: ItemTable (nebo původní FetchedItem seznam) pro kontext
 
         Returns:
             Obohacená keywords_data se sloupcem "categories"
         """
+        # Invertovaný index: slova slovníku nalezená v každé položce – jeden průchod textem
+        # položky; kontext klíčového slova je pak jen sjednocení množin jeho položek
+        item_words = [
+            frozenset(self._find_words(text)) for text in as_table(items).texts_lower
+        ]
+        n_items = len(item_words)
+
         for kw_data in keywords_data:
             keyword = kw_data["keyword"]
 
-            # Sestavení kontextu z příslušných položek
-            context_parts = []
+            context_words: set[str] = set()
             for idx in kw_data.get("source_items", []):
-                if idx < len(items):
-                    item = items[idx]
-                    context_parts.append(f"{item.title} {item.description}")
-            context = " ".join(context_parts)
+                if idx < n_items:
+                    context_words |= item_words[idx]
 
-            kw_data["categories"] = self.categorize(keyword, context)
+            kw_data["categories"] = self._categorize_lower(keyword.lower().strip(), context_words)
 
         logger.info("Kategorizováno %d klíčových slov", len(keywords_data))
         return keywords_data
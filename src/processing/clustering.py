@@ -1,14 +1,24 @@
 """Topic clustering pomocí MiniBatchKMeans."""
 
-import html
 import logging
-import re
 
 import numpy as np
 from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+from sklearn.preprocessing import normalize as l2_normalize
 
 from src.fetchers.base import FetchedItem
+from src.processing.extractor import TfidfCorpus, build_documents
+from src.processing.item_table import ItemTable
+
+# Volitelně: faiss k-means (C++/SIMD) nad hustou LSA projekcí – jinak MiniBatchKMeans nad řídkou maticí
+try:
+    import faiss
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
 
 # Rozšířené stop words pro čistší clustering
 _EXTRA_STOPS = {
@@ -18,6 +28,16 @@ _EXTRA_STOPS = {
 }
 _CUSTOM_STOP_WORDS = list(ENGLISH_STOP_WORDS | _EXTRA_STOPS)
 
+# Parametry vlastní TF-IDF pro clustering (i výběru ze sdílené matice)
+_MAX_FEATURES = 3000
+_MAX_NGRAM = 2
+_MIN_DF = 2
+_MAX_DF = 0.85
+
+# LSA projekce a iterace pro faiss k-means
+_SVD_COMPONENTS = 128
+_FAISS_NITER = 20
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,9 +50,14 @@ class TopicClusterer:
         self.min_clusters: int = clustering_config.get("min_clusters", 3)
         self.max_clusters: int = clustering_config.get("max_clusters", 15)
 
-    def cluster(self, items: list[FetchedItem]) -> list[dict]:
+    def cluster(
+        self, items: ItemTable | list[FetchedItem], corpus: TfidfCorpus | None = None
+    ) -> list[dict]:
         """Seskupí položky do tematických clusterů.
 
+        Args:
+            corpus: Sdílená TF-IDF matice z KeywordExtractor.vectorize – jinak se fituje vlastní
+
         Returns:
             Seznam: [{"cluster_id": int, "label": str, "top_terms": list[str],
                        "item_indices": list[int], "size": int}]
@@ -48,55 +73,61 @@ class TopicClusterer:
             )
             return []
 
-        # Sestavení a čištění dokumentů
-        documents = []
-        for item in items:
-            text = html.unescape(f"{item.title} {item.description}")
-            text = re.sub(r"<[^>]+>", " ", text)
-            text = re.sub(r"\b[0-9a-f]{6}\b", " ", text)
-            text = re.sub(r"https?://\S+", " ", text)
-            text = re.sub(r"\s+", " ", text).strip()
-            documents.append(text)
-        valid_docs = [(i, doc) for i, doc in enumerate(documents) if doc.strip()]
-
-        if len(valid_docs) < self.min_clusters + 1:
-            return []
+        if corpus is not None and self._can_reuse(corpus):
+            indices = corpus.indices
+            tfidf_matrix, feature_names = self._select_features(corpus)
+        else:
+            # Krátké tokeny zůstávají (jako před sdíleným čištěním) – rozhoduje TF-IDF
+            indices, texts = build_documents(items, drop_short=False)
+            if len(texts) < self.min_clusters + 1:
+                return []
+
+            # TF-IDF vektorizace s rozšířenými stop words
+            tfidf = TfidfVectorizer(
+                max_features=_MAX_FEATURES,
+                stop_words=_CUSTOM_STOP_WORDS,
+                ngram_range=(1, _MAX_NGRAM),
+                min_df=_MIN_DF,
+                max_df=_MAX_DF,
+            )
 
-        indices = [i for i, _ in valid_docs]
-        texts = [doc for _, doc in valid_docs]
+            try:
+                tfidf_matrix = tfidf.fit_transform(texts)
+            except ValueError as e:
+                logger.error("TF-IDF pro clustering selhal: %s", e)
+                return []
 
-        # TF-IDF vektorizace s rozšířenými stop words
-        tfidf = TfidfVectorizer(
-            max_features=3000,
-            stop_words=_CUSTOM_STOP_WORDS,
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.85,
-        )
+            feature_names = tfidf.get_feature_names_out()
 
-        try:
-            tfidf_matrix = tfidf.fit_transform(texts)
-        except ValueError as e:
-            logger.error("TF-IDF pro clustering selhal: %s", e)
+        n_docs = len(indices)
+        if n_docs < self.min_clusters + 1 or tfidf_matrix.shape[1] == 0:
             return []
 
-        feature_names = tfidf.get_feature_names_out()
+        # S faiss: projekce do husté float32 matice (LSA), na které běží k-means i silhouette
+        svd = None
+        vectors = tfidf_matrix
+        if FAISS_AVAILABLE:
+            n_components = min(_SVD_COMPONENTS, tfidf_matrix.shape[1] - 1, n_docs - 1)
+            if n_components >= 2:
+                svd = TruncatedSVD(n_components=n_components, random_state=42)
+                vectors = np.ascontiguousarray(
+                    svd.fit_transform(tfidf_matrix), dtype=np.float32
+                )
 
         # Určení optimálního počtu clusterů pomocí silhouette score
-        optimal_k = self._find_optimal_k(tfidf_matrix, len(texts))
+        optimal_k, centers, labels = self._find_optimal_k(vectors, n_docs)
 
-        # Clustering
-        kmeans = MiniBatchKMeans(
-            n_clusters=optimal_k,
-            random_state=42,
-            batch_size=min(256, len(texts)),
-            n_init=3,
-        )
-        labels = kmeans.fit_predict(tfidf_matrix)
+        # Clustering – jen pokud model z hledání K nelze znovu použít
+        if centers is None:
+            centers, labels = self._fit_kmeans(vectors, optimal_k, n_init=3)
+
+        # Centroidy z LSA prostoru zpět do prostoru termů
+        if svd is not None:
+            centers = svd.inverse_transform(centers)
 
         # Extrakce top termů pro každý cluster
         results = []
-        order_centroids = kmeans.cluster_centers_.argsort()[:, ::-1]
+        order_centroids = centers.argsort()[:, ::-1]
 
         for cluster_id in range(optimal_k):
             # Top termy z centroidu
@@ -125,46 +156,118 @@ class TopicClusterer:
         # Seřazení podle velikosti (největší první)
         results.sort(key=lambda x: x["size"], reverse=True)
 
-        logger.info("Clustering: %d clusterů z %d položek", len(results), len(texts))
+        logger.info("Clustering: %d clusterů z %d položek", len(results), n_docs)
         return results
 
-    def _find_optimal_k(self, tfidf_matrix, n_samples: int) -> int:
-        """Najde optimální počet clusterů pomocí silhouette score."""
+    @staticmethod
+    def _can_reuse(corpus: TfidfCorpus) -> bool:
+        """Obsahuje sdílená matice všechny features, které by měla vlastní TF-IDF?
+
+        Musí pokrývat 1–2-gramy se stejným min_df a slovník nesmí být oříznutý
+        max_features extraktoru (jinak by trigramy vytlačily kratší n-gramy).
+        """
+        low, high = corpus.ngram_range
+        return low <= 1 and high >= _MAX_NGRAM and corpus.min_df == _MIN_DF and not corpus.truncated
+
+    def _select_features(self, corpus: TfidfCorpus):
+        """Vybere ze sdílené matice n-gramy do délky 2 a nejčastějších N features.
+
+        IDF váhy nezávisí na ostatních features, stačí tedy vybrat sloupce
+        a znovu L2-normalizovat řádky. Zbývající rozdíly proti vlastní TF-IDF:
+        sdílená matice má max_df extraktoru (0.8 místo 0.85) – termy v 80–85 %
+        dokumentů chybí –, dokumenty extraktoru nemají krátké 1-2 znakové tokeny
+        (kromě _KEEP_SHORT) a oříznutí na _MAX_FEATURES řadí podle počtu dokumentů
+        místo četnosti termů. Výsledné clustery tak nejsou bit po bitu shodné.
+        """
+        feature_names = corpus.feature_names
+        ngram_ok = np.fromiter(
+            (name.count(" ") < _MAX_NGRAM for name in feature_names),
+            dtype=bool,
+            count=len(feature_names),
+        )
+        candidates = np.flatnonzero(ngram_ok)
+
+        if len(candidates) > _MAX_FEATURES:
+            # Jako max_features: nejčastější termy (zde podle počtu dokumentů)
+            doc_counts = np.diff(corpus.matrix.tocsc().indptr)[candidates]
+            top = np.argsort(-doc_counts, kind="stable")[:_MAX_FEATURES]
+            candidates = np.sort(candidates[top])
+
+        matrix = l2_normalize(corpus.matrix[:, candidates])
+        return matrix, feature_names[candidates]
+
+    def _fit_kmeans(self, vectors, k: int, n_init: int) -> tuple[np.ndarray, np.ndarray]:
+        """Natrénuje k-means. Vrací (centroidy, labely).
+
+        Hustá float32 matice (LSA projekce) jde přes faiss, řídká TF-IDF přes MiniBatchKMeans.
+        """
+        if FAISS_AVAILABLE and isinstance(vectors, np.ndarray):
+            # min_points_per_centroid=1 – malé korpusy jsou běžné, faiss by jinak varoval na stderr
+            kmeans = faiss.Kmeans(
+                vectors.shape[1], k, niter=_FAISS_NITER, nredo=n_init, seed=42,
+                verbose=False, min_points_per_centroid=1,
+            )
+            kmeans.train(vectors)
+            _, labels = kmeans.index.search(vectors, 1)
+            return kmeans.centroids, labels.ravel()
+
+        kmeans = MiniBatchKMeans(
+            n_clusters=k,
+            random_state=42,
+            batch_size=min(256, vectors.shape[0]),
+            n_init=n_init,
+        )
+        labels = kmeans.fit_predict(vectors)
+        return kmeans.cluster_centers_, labels
+
+    def _find_optimal_k(self, vectors, n_samples: int) -> tuple[int, object, object]:
+        """Najde optimální počet clusterů pomocí silhouette score.
+
+        Returns:
+            Tuple (K, centroidy, labely). Centroidy a labely jsou None,
+            pokud hledání neproběhlo a je třeba model natrénovat.
+        """
         max_k = min(self.max_clusters, n_samples - 1)
         min_k = min(self.min_clusters, max_k)
 
         if max_k <= min_k:
-            return min_k
+            return min_k, None, None
 
         # Pro malé datasety neoptimalizujeme
         if n_samples < 20:
-            return min_k
+            return min_k, None, None
 
         try:
             from sklearn.metrics import silhouette_score
 
             best_k = min_k
             best_score = -1.0
+            best_centers = None
+            best_labels = None
+
+            # Jeden pevný vzorek pro silhouette napříč všemi K
+            rng = np.random.default_rng(42)
+            sample_idx = rng.choice(n_samples, size=min(500, n_samples), replace=False)
+            sample_matrix = vectors[sample_idx]
 
             for k in range(min_k, max_k + 1):
-                kmeans = MiniBatchKMeans(
-                    n_clusters=k, random_state=42, n_init=2,
-                    batch_size=min(256, n_samples),
-                )
-                labels = kmeans.fit_predict(tfidf_matrix)
+                centers, labels = self._fit_kmeans(vectors, k, n_init=2)
+                sample_labels = labels[sample_idx]
 
                 # Silhouette score potřebuje alespoň 2 clustery a 2 vzorky
-                if len(set(labels)) < 2:
+                if len(set(sample_labels)) < 2:
                     continue
 
-                score = silhouette_score(tfidf_matrix, labels, sample_size=min(500, n_samples))
+                score = silhouette_score(sample_matrix, sample_labels)
                 if score > best_score:
                     best_score = score
                     best_k = k
+                    best_centers = centers
+                    best_labels = labels
 
             logger.debug("Optimální K=%d (silhouette=%.3f)", best_k, best_score)
-            return best_k
+            return best_k, best_centers, best_labels
 
         except Exception as e:
             logger.warning("Silhouette score selhal, používám min_clusters=%d: %s", min_k, e)
-            return min_k
+            return min_k, None, None
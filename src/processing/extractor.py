@@ -1,12 +1,14 @@
 """Extrakce klíčových slov z textu pomocí TF-IDF (a volitelně KeyBERT)."""
 
 import logging
-import re
+from dataclasses import dataclass
 
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 from src.fetchers.base import FetchedItem
+from src.processing.item_table import ItemTable, as_table
+from src.processing.textclean import normalize
 
 logger = logging.getLogger(__name__)
 
@@ -19,23 +21,30 @@ except ImportError:
     KEYBERT_AVAILABLE = False
 
 
-def _clean_text(text: str) -> str:
-    """Vyčistí text od HTML tagů, entit a přebytečných mezer."""
-    import html
+@dataclass(slots=True)
+class TfidfCorpus:
+    """Jednou napočítaná TF-IDF matice – sdílí ji extrakce klíčových slov i clustering."""
 
-    # Dekódování HTML entit (&nbsp; &amp; atd.)
-    text = html.unescape(text)
-    # Odstranění HTML tagů
-    text = re.sub(r"<[^>]+>", " ", text)
-    # Odstranění zbylých HTML atributů a hex kódů (6f6f6f, href, span, font...)
-    text = re.sub(r"\b[0-9a-f]{6}\b", " ", text)
-    # Odstranění URL
-    text = re.sub(r"https?://\S+", " ", text)
-    # Odstranění krátkých nesmyslných tokenů (1-2 znaky, které nejsou AI/ML/PR/HR apod.)
-    text = re.sub(r"\b[a-z]{1,2}\b(?<!\bai\b)(?<!\bml\b)(?<!\bhr\b)(?<!\bpr\b)(?<!\bux\b)(?<!\bui\b)(?<!\bqa\b)(?<!\bci\b)(?<!\bcd\b)", " ", text)
-    # Normalizace mezer
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    indices: list[int]          # Index položky v items pro každý řádek matice
+    texts: list[str]            # Vyčištěné dokumenty (řádky matice)
+    matrix: object              # Řídká CSR matice (dokumenty × features)
+    feature_names: np.ndarray
+    ngram_range: tuple[int, int] = (1, 1)
+    min_df: int | float = 1
+    truncated: bool = False     # Slovník oříznutý max_features – část termů v matici chybí
+
+
+def build_documents(
+    items: ItemTable | list[FetchedItem], drop_short: bool = True
+) -> tuple[list[int], list[str]]:
+    """Vyčistí title + description a vrátí (indexy, texty) neprázdných dokumentů."""
+    table = as_table(items)
+    documents = [
+        normalize(f"{title} {description}", drop_short)
+        for title, description in zip(table.titles, table.descriptions)
+    ]
+    valid_docs = [(i, doc) for i, doc in enumerate(documents) if doc.strip()]
+    return [i for i, _ in valid_docs], [doc for _, doc in valid_docs]
 
 
 class KeywordExtractor:
@@ -65,57 +74,76 @@ class KeywordExtractor:
             max_df=0.8,
         )
 
-    def extract(self, items: list[FetchedItem]) -> list[dict]:
+    def vectorize(self, items: ItemTable | list[FetchedItem]) -> TfidfCorpus | None:
+        """Napočítá TF-IDF matici pro položky. Vrací None, pokud je dokumentů příliš málo."""
+        indices, texts = build_documents(items)
+        if len(texts) < 2:
+            logger.warning("Příliš málo dokumentů pro TF-IDF (%d)", len(texts))
+            return None
+        return self._fit(texts, indices)
+
+    def _fit(self, documents: list[str], indices: list[int]) -> TfidfCorpus | None:
+        """Nafituje TF-IDF na dokumenty."""
+        try:
+            tfidf_matrix = self.tfidf.fit_transform(documents)
+        except ValueError as e:
+            logger.error("TF-IDF fit_transform selhal: %s", e)
+            return None
+        feature_names = self.tfidf.get_feature_names_out()
+        return TfidfCorpus(
+            indices=indices,
+            texts=documents,
+            matrix=tfidf_matrix.tocsr(),
+            feature_names=feature_names,
+            ngram_range=tuple(self.tfidf.ngram_range),
+            min_df=self.tfidf.min_df,
+            truncated=len(feature_names) >= self.tfidf.max_features,
+        )
+
+    def extract(
+        self, items: ItemTable | list[FetchedItem], corpus: TfidfCorpus | None = None
+    ) -> list[dict]:
         """Extrahuje top N klíčových slov z kolekce položek.
 
+        Args:
+            corpus: Předem napočítaná TF-IDF matice (z vectorize) – jinak se fituje zde
+
         Returns:
             Seznam slovníků: [{"keyword": str, "score": float, "count": int, "source_items": list[int]}]
         """
         if not items:
             return []
 
-        # Sestavení dokumentů (title + description)
-        documents = [
-            _clean_text(f"{item.title} {item.description}") for item in items
-        ]
-
-        # Odfiltrování prázdných dokumentů
-        valid_docs = [(i, doc) for i, doc in enumerate(documents) if doc.strip()]
-        if len(valid_docs) < 2:
-            logger.warning("Příliš málo dokumentů pro TF-IDF (%d)", len(valid_docs))
-            return []
-
-        indices = [i for i, _ in valid_docs]
-        texts = [doc for _, doc in valid_docs]
-
         if self.method == "keybert" and KEYBERT_AVAILABLE:
-            return self._extract_keybert(texts, indices, items)
-        return self._extract_tfidf(texts, indices, items)
-
-    def _extract_tfidf(
-        self, documents: list[str], indices: list[int], items: list[FetchedItem]
-    ) -> list[dict]:
-        """Extrakce pomocí TF-IDF."""
-        try:
-            tfidf_matrix = self.tfidf.fit_transform(documents)
-        except ValueError as e:
-            logger.error("TF-IDF fit_transform selhal: %s", e)
+            indices, texts = build_documents(items)
+            if len(texts) < 2:
+                logger.warning("Příliš málo dokumentů pro KeyBERT (%d)", len(texts))
+                return []
+            return self._extract_keybert(texts, indices)
+
+        if corpus is None:
+            corpus = self.vectorize(items)
+        if corpus is None:
             return []
+        return self._extract_tfidf(corpus)
 
-        feature_names = self.tfidf.get_feature_names_out()
+    def _extract_tfidf(self, corpus: TfidfCorpus) -> list[dict]:
+        """Extrakce pomocí TF-IDF."""
+        tfidf_matrix = corpus.matrix
+        feature_names = corpus.feature_names
+        indices = corpus.indices
 
         # Agregovaný TF-IDF score přes všechny dokumenty
         aggregated_scores = np.asarray(tfidf_matrix.sum(axis=0)).flatten()
 
-        # Počet dokumentů, kde se keyword vyskytuje
-        doc_counts = np.asarray((tfidf_matrix > 0).sum(axis=0)).flatten()
+        # Počet dokumentů, kde se keyword vyskytuje (nenulové prvky ve sloupci)
+        doc_counts = np.diff(tfidf_matrix.tocsc().indptr)
 
-        # Mapování keyword -> zdrojové položky
+        # Mapování keyword -> zdrojové položky – přímo z CSR řádků, bez zhuštění matice
+        indptr, feat_indices = tfidf_matrix.indptr, tfidf_matrix.indices
         keyword_items: dict[int, list[int]] = {}
-        matrix_array = tfidf_matrix.toarray()
-        for doc_idx in range(len(documents)):
-            nonzero = matrix_array[doc_idx].nonzero()[0]
-            for feat_idx in nonzero:
+        for doc_idx in range(tfidf_matrix.shape[0]):
+            for feat_idx in feat_indices[indptr[doc_idx] : indptr[doc_idx + 1]].tolist():
                 keyword_items.setdefault(feat_idx, []).append(indices[doc_idx])
 
         # Seřazení podle aggregated score
@@ -138,9 +166,7 @@ class KeywordExtractor:
         logger.info("TF-IDF: extrahováno %d klíčových slov", len(results))
         return results
 
-    def _extract_keybert(
-        self, documents: list[str], indices: list[int], items: list[FetchedItem]
-    ) -> list[dict]:
+    def _extract_keybert(self, documents: list[str], indices: list[int]) -> list[dict]:
         """Extrakce pomocí KeyBERT (pokud dostupný)."""
         try:
             model = KeyBERT()
@@ -176,4 +202,5 @@ class KeywordExtractor:
 
         except Exception as e:
             logger.warning("KeyBERT selhal, fallback na TF-IDF: %s", e)
-            return self._extract_tfidf(documents, indices, items)
+            corpus = self._fit(documents, indices)
+            return self._extract_tfidf(corpus) if corpus is not None else []
@@ -0,0 +1,66 @@
+"""Sloupcová (SoA) reprezentace položek pro processing."""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.fetchers.base import FetchedItem
+
+
+def _aware(published: datetime) -> datetime:
+    """Naivní datum bere jako UTC."""
+    if published.tzinfo is None:
+        return published.replace(tzinfo=timezone.utc)
+    return published
+
+
+@dataclass(slots=True)
+class ItemTable:
+    """Paralelní pole atributů položek – sestaví se jednou na vstupu do processingu.
+
+    Extrakce, kategorizace, scoring i clustering pak pracují s poli
+    (NumPy řezy, předpočítané texty) místo atributů jednotlivých objektů.
+    """
+
+    titles: list[str]
+    descriptions: list[str]
+    texts_lower: list[str]              # "title description" v lowercase (kategorizace)
+    published: list[datetime | None]    # Timezone-aware datum publikace
+    published_ts: np.ndarray            # float64 Unix timestamp, NaN = bez data
+    engagement: np.ndarray              # int64 score/upvotes, záporné oříznuté na 0
+    source_ids: np.ndarray              # intp index do source_names
+    source_names: np.ndarray            # Seřazené unikátní názvy zdrojů
+
+    @classmethod
+    def from_items(cls, items: list[FetchedItem]) -> "ItemTable":
+        """Sestaví tabulku ze seznamu FetchedItem."""
+        titles = [item.title for item in items]
+        descriptions = [item.description for item in items]
+        published = [_aware(item.published) if item.published else None for item in items]
+        source_names, source_ids = np.unique(
+            np.array([item.source for item in items], dtype=object), return_inverse=True
+        )
+
+        return cls(
+            titles=titles,
+            descriptions=descriptions,
+            texts_lower=[f"{t} {d}".lower() for t, d in zip(titles, descriptions)],
+            published=published,
+            published_ts=np.array(
+                [p.timestamp() if p else np.nan for p in published], dtype=np.float64
+            ),
+            engagement=np.array([max(item.score, 0) for item in items], dtype=np.int64),
+            source_ids=source_ids.astype(np.intp, copy=False),
+            source_names=source_names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+
+def as_table(items: "ItemTable | list[FetchedItem]") -> ItemTable:
+    """Vrátí ItemTable – seznam FetchedItem převede, hotovou tabulku nechá beze změny."""
+    if isinstance(items, ItemTable):
+        return items
+    return ItemTable.from_items(items)
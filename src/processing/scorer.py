@@ -4,7 +4,10 @@ import logging
 import math
 from datetime import datetime, timezone
 
+import numpy as np
+
 from src.fetchers.base import FetchedItem
+from src.processing.item_table import ItemTable, as_table
 
 logger = logging.getLogger(__name__)
 
@@ -104,45 +107,79 @@ class TrendScorer:
     def score_batch(
         self,
         keywords_data: list[dict],
-        items: list[FetchedItem],
+        items: ItemTable | list[FetchedItem],
         all_sources: set[str],
     ) -> list[dict]:
         """Spočítá score pro seznam klíčových slov najednou.
 
+        Vstupy (stáří, engagement, zdroj) jsou sloupce ItemTable,
+        per keyword se pak jen řežou NumPy pole.
+
         Args:
             keywords_data: Seznam z extractoru [{"keyword": str, "source_items": list[int], ...}]
-            items: Původní FetchedItem seznam
+            items: ItemTable (nebo původní FetchedItem seznam)
             all_sources: Množina všech zdrojů
 
         Returns:
             Obohacená keywords_data se scoring poli
         """
         total_items = len(items)
+        now_ts = datetime.now(tz=timezone.utc).timestamp()
+        decay = max(self.decay_hours, 1)
+        n_sources = max(len(all_sources), 1)
+
+        table = as_table(items)
+        published_ts = table.published_ts
+        engagement = table.engagement
 
         for kw_data in keywords_data:
-            # Sesbírat matching items
-            matching = [
-                items[idx]
-                for idx in kw_data.get("source_items", [])
-                if idx < len(items)
-            ]
-
-            score_result = self.score(
-                kw_data["keyword"], matching, total_items, all_sources
+            idx = np.asarray(kw_data.get("source_items", []), dtype=np.intp)
+            idx = idx[idx < total_items]
+
+            if not len(idx):
+                score_result = self.score(kw_data["keyword"], [], total_items, all_sources)
+                score_result.pop("keyword")
+                kw_data.update(score_result)
+                continue
+
+            # Frequency score: poměr zmínek vůči celku
+            mention_count = len(idx)
+            frequency_score = min(mention_count / max(total_items, 1), 1.0)
+
+            # Recency score: exponenciální rozpad podle stáří nejnovější položky
+            recency_score = 0.0
+            latest_date = None
+            kw_ts = published_ts[idx]
+            if not np.isnan(kw_ts).all():
+                latest = int(np.nanargmax(kw_ts))
+                latest_date = table.published[idx[latest]]
+                age_hours = (now_ts - kw_ts[latest]) / 3600
+                recency_score = math.exp(-age_hours / decay)
+
+            # Source diversity score: kolik různých zdrojů zmiňuje keyword
+            unique_ids = np.unique(table.source_ids[idx])
+            source_diversity_score = len(unique_ids) / n_sources
+
+            # Engagement score: log scale normalizovaného součtu score/upvotes
+            total_engagement = int(engagement[idx].sum())
+            engagement_score = min(math.log1p(total_engagement) / 10.0, 1.0)
+
+            # Vážený celkový score
+            trend_score = (
+                self.w_frequency * frequency_score
+                + self.w_recency * recency_score
+                + self.w_diversity * source_diversity_score
+                + self.w_engagement * engagement_score
             )
 
-            # Přidat scoring pole do kw_data
-            for key in [
-                "trend_score",
-                "frequency_score",
-                "recency_score",
-                "source_diversity_score",
-                "engagement_score",
-                "mention_count",
-                "sources",
-                "latest_date",
-            ]:
-                kw_data[key] = score_result[key]
+            kw_data["trend_score"] = round(trend_score, 4)
+            kw_data["frequency_score"] = round(frequency_score, 4)
+            kw_data["recency_score"] = round(recency_score, 4)
+            kw_data["source_diversity_score"] = round(source_diversity_score, 4)
+            kw_data["engagement_score"] = round(engagement_score, 4)
+            kw_data["mention_count"] = mention_count
+            kw_data["sources"] = [str(name) for name in table.source_names[unique_ids]]
+            kw_data["latest_date"] = latest_date.isoformat() if latest_date else None
 
         # Seřazení podle trend_score
         keywords_data.sort(key=lambda x: x.get("trend_score", 0), reverse=True)
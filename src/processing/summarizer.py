@@ -1,37 +1,161 @@
 """AI sumarizace témat pomocí Claude API (Anthropic)."""
 
+import asyncio
 import logging
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Optional
 
+from src.storage.response_cache import ResponseCache, content_key
+
 logger = logging.getLogger(__name__)
 
 try:
     import anthropic
+    import httpx
 
     ANTHROPIC_AVAILABLE = True
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 
+# Statické instrukce – system prompt společný všem clusterům (i dávkám);
+# v uživatelské zprávě jsou jen data tématu
+_SUMMARY_SYSTEM_PROMPT = """Jsi expert na digital marketing, AI a data analytics. Analyzuj zadané téma a související články.
+
+Odpověz ve strukturovaném formátu (česky):
+
+SOUHRN (2-3 věty):
+Co se aktuálně děje v tomto tématu? Jaký je hlavní trend nebo událost?
+
+PROČ JE TO DŮLEŽITÉ (1-2 věty):
+Proč by to mělo zajímat digital marketing/analytics profesionála?
+
+NÁVRH ČLÁNKU - TITULEK:
+Navrhni titulek pro LinkedIn příspěvek nebo článek, který by mohl napsat analytik/konzultant.
+
+NÁVRH ČLÁNKU - ÚHEL:
+Jaký úhel pohledu zvolit? Co konkrétně rozebrat? (2-3 věty)"""
+
+# Dodatek pro dávku více malých témat v jednom volání
+_BATCH_INSTRUCTIONS = """Dostaneš více témat najednou, každé uvozené řádkem "### TÉMA <číslo> ###".
+Pro KAŽDÉ téma vrať samostatný blok uvozený stejným řádkem "### TÉMA <číslo> ###" a v něm odpověď ve výše uvedeném formátu."""
+
+# Oddělovač bloků v dávkové odpovědi
+_BATCH_MARKER_RE = re.compile(r"^\s*#{3}\s*TÉMA\s+(\d+)\s*#{3}\s*$", re.MULTILINE)
+
+# Hlavičky sekcí odpovědi (na začátku řádku) -> klíč výsledku
+_SECTION_TO_KEY = {
+    "SOUHRN": "summary",
+    "PROČ JE TO DŮLEŽITÉ": "why_it_matters",
+    "NÁVRH ČLÁNKU - TITULEK": "article_idea",
+    "NÁVRH ČLÁNKU - ÚHEL": "article_angle",
+}
+_SECTION_RE = re.compile(
+    r"^[^\S\n]*(" + "|".join(map(re.escape, _SECTION_TO_KEY)) + r")([^\n]*)$",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+
+def _sections_done_at(text: str) -> int | None:
+    """Pozice, kde model po všech čtyřech sekcích začal další sekci (jinak None)."""
+    seen: set[str] = set()
+    for match in _SECTION_RE.finditer(text):
+        key = match.group(1).upper()
+        if key in seen and len(seen) == len(_SECTION_TO_KEY):
+            return match.start()
+        seen.add(key)
+    return None
+
+
+_INTRO_SYSTEM_PROMPT = """Jsi editor denního newsletteru o trendech v digital marketingu, AI a analytics.
+
+Napiš krátký úvodní odstavec (3-4 věty, česky) pro denní newsletter. Buď stručný, věcný a zajímavý. Zaměř se na to, co je dnes nejzajímavější a proč. Nepoužívej emoji."""
+
+
 class TopicSummarizer:
     """Generuje AI souhrny témat a návrhy článků pomocí Claude API."""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, data_dir: Path | None = None):
         ai_config = config.get("ai", {})
         self.enabled: bool = ai_config.get("enabled", False)
         self.api_key: str = ai_config.get("anthropic_api_key", "")
         self.model: str = ai_config.get("model", "claude-sonnet-4-5-20250929")
         self.max_tokens: int = ai_config.get("max_tokens", 1024)
-        self.client: Optional[object] = None
+        # Maximální počet souběžných Claude volání (kvůli rate limitům API)
+        self.max_concurrency: int = max(1, ai_config.get("max_concurrency", 5))
+        # Malé clustery (do small_cluster_size článků) se sumarizují po dávkách v jednom volání
+        self.small_cluster_size: int = ai_config.get("small_cluster_size", 3)
+        self.batch_size: int = max(1, ai_config.get("batch_size", 4))
+        # Přechodné chyby (429/529/5xx, výpadky spojení) opakuje SDK s exponenciálním backoffem;
+        # request_timeout je horní mez celého volání včetně opakování
+        self.max_retries: int = ai_config.get("max_retries", 4)
+        self.request_timeout: float = ai_config.get("request_timeout", 90)
+        # Async klient (a jeho httpx pool) patří k event loopu, ve kterém vznikl – otevírá se
+        # v _client_session pro každý běh (asyncio.run) a po něm se zavře
+        self.client_available: bool = bool(self.enabled and ANTHROPIC_AVAILABLE and self.api_key)
+        self.async_client: Optional[object] = None
+        self._client_users = 0
+
+        # Cache odpovědí podle obsahu clusteru – opakované běhy neplatí stejná volání znovu
+        self.cache: ResponseCache | None = None
+        # Úvod se při stejných tématech dne znovu negeneruje (kratší platnost než souhrny)
+        self.intro_cache_ttl: float = ai_config.get("intro_cache_ttl_hours", 24) * 3600
+        if data_dir is not None and ai_config.get("cache_enabled", True):
+            self.cache = ResponseCache(data_dir, ttl_days=ai_config.get("cache_ttl_days", 7))
+
+    def _new_client(self):
+        """Vytvoří AsyncAnthropic klienta se sdíleným poolem spojení."""
+        return anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            max_retries=self.max_retries,
+            timeout=httpx.Timeout(60.0, connect=5.0, write=10.0, pool=5.0),
+            # Sdílený pool spojení – TLS handshake se platí jednou za běh, ne per volání
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency * 2,
+                    max_keepalive_connections=self.max_concurrency * 2,
+                )
+            ),
+        )
 
-        if self.enabled and ANTHROPIC_AVAILABLE and self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+    @asynccontextmanager
+    async def _client_session(self):
+        """Zpřístupní self.async_client v aktuálním event loopu.
+
+        Vnořená / souběžná volání v témže loopu sdílí jednoho klienta; zavře se,
+        až skončí poslední z nich. Keep-alive spojení se tak nikdy nepřenesou
+        do dalšího asyncio.run (kde by selhala na "Event loop is closed").
+        """
+        if self.async_client is None:
+            self.async_client = self._new_client()
+        self._client_users += 1
+        try:
+            yield self.async_client
+        finally:
+            self._client_users -= 1
+            if self._client_users == 0:
+                client, self.async_client = self.async_client, None
+                await client.close()
 
     def summarize_topic_group(
         self,
         topic_label: str,
         articles: list[dict],
         category: str = "",
+    ) -> dict:
+        """Synchronní wrapper nad summarize_topic_group_async."""
+        result = asyncio.run(self.summarize_topic_group_async(topic_label, articles, category))
+        if self.cache is not None:
+            self.cache.save()
+        return result
+
+    async def summarize_topic_group_async(
+        self,
+        topic_label: str,
+        articles: list[dict],
+        category: str = "",
     ) -> dict:
         """Vygeneruje souhrn pro skupinu článků pod jedním tématem.
 
@@ -43,50 +167,163 @@ class TopicSummarizer:
         Returns:
             {"summary": str, "why_it_matters": str, "article_idea": str, "article_angle": str}
         """
-        if not self.client:
+        if not self.client_available:
             return self._fallback_summary(topic_label, articles)
 
-        # Sestavení kontextu z článků
-        articles_text = "\n".join(
-            f"- {a.get('title', '')} ({a.get('source', '')})"
-            for a in articles[:15]
-        )
+        cache_key = self._cache_key(topic_label, articles, category)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("AI souhrn pro '%s' z cache", topic_label)
+                return cached
 
-        prompt = f"""Jsi expert na digital marketing, AI a data analytics. Analyzuj toto téma a související články.
+        prompt = self._topic_prompt(topic_label, articles, category)
 
-TÉMA: {topic_label}
-KATEGORIE: {category}
+        try:
+            async with self._client_session():
+                text = await asyncio.wait_for(
+                    self._stream_sections(
+                        topic_label,
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        system=_SUMMARY_SYSTEM_PROMPT,
+                        messages=[{"role": "user", "content": prompt}],
+                    ),
+                    self.request_timeout,
+                )
+            return self._accept_result(cache_key, self._parse_response(text), topic_label, articles)
 
-ČLÁNKY:
-{articles_text}
+        except Exception as e:
+            logger.warning("Claude API volání selhalo pro '%s': %s", topic_label, e)
+            return self._fallback_summary(topic_label, articles)
 
-Odpověz ve strukturovaném formátu (česky):
+    async def _stream_sections(self, topic_label: str, **request) -> str:
+        """Streamuje odpověď a průběžně hlídá sekce.
 
-SOUHRN (2-3 věty):
-Co se aktuálně děje v tomto tématu? Jaký je hlavní trend nebo událost?
+        Jakmile jsou všechny čtyři sekce hotové a model začne další (opakovanou)
+        sekci, stream se ukončí – zbytek by parser stejně zahodil a platily by se
+        zbytečné výstupní tokeny. Při chybě streamu fallback na messages.create.
+        """
+        try:
+            async with self.async_client.messages.stream(**request) as stream:
+                buffer = ""
+                async for chunk in stream.text_stream:
+                    buffer += chunk
+                    # Hlavičky sekcí začínají na novém řádku – kontrola jen při "\n"
+                    if "\n" in chunk:
+                        cut = _sections_done_at(buffer)
+                        if cut is not None:
+                            logger.debug("Stream pro '%s' ukončen po všech sekcích", topic_label)
+                            return buffer[:cut]
+                return buffer
+        except Exception as e:
+            logger.debug("Streaming selhal pro '%s', fallback na create: %s", topic_label, e)
 
-PROČ JE TO DŮLEŽITÉ (1-2 věty):
-Proč by to mělo zajímat digital marketing/analytics profesionála?
+        response = await self.async_client.messages.create(**request)
+        return response.content[0].text
 
-NÁVRH ČLÁNKU - TITULEK:
-Navrhni titulek pro LinkedIn příspěvek nebo článek, který by mohl napsat analytik/konzultant.
+    def summarize_topic_batch(self, groups: list[tuple[str, list[dict], str]]) -> list[dict]:
+        """Synchronní wrapper nad summarize_topic_batch_async."""
+        results = asyncio.run(self.summarize_topic_batch_async(groups))
+        if self.cache is not None:
+            self.cache.save()
+        return results
 
-NÁVRH ČLÁNKU - ÚHEL:
-Jaký úhel pohledu zvolit? Co konkrétně rozebrat? (2-3 věty)"""
+    async def summarize_topic_batch_async(
+        self, groups: list[tuple[str, list[dict], str]]
+    ) -> list[dict]:
+        """Vygeneruje souhrny pro více (malých) témat jedním voláním Claude.
 
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}],
+        Args:
+            groups: Seznam (topic_label, articles, category) – stejné vstupy jako summarize_topic_group
+
+        Returns:
+            Souhrny ve stejném pořadí jako groups
+        """
+        results: list[dict | None] = [None] * len(groups)
+        pending: list[int] = []
+        keys = [self._cache_key(label, articles, category) for label, articles, category in groups]
+
+        for i, (label, articles, _) in enumerate(groups):
+            cached = self.cache.get(keys[i]) if self.cache is not None else None
+            if cached is not None:
+                logger.debug("AI souhrn pro '%s' z cache", label)
+                results[i] = cached
+            elif not self.client_available:
+                results[i] = self._fallback_summary(label, articles)
+            else:
+                pending.append(i)
+
+        if len(pending) == 1:
+            label, articles, category = groups[pending[0]]
+            results[pending[0]] = await self.summarize_topic_group_async(label, articles, category)
+        elif pending:
+            prompt = "\n\n".join(
+                f"### TÉMA {n} ###\n" + self._topic_prompt(*groups[i])
+                for n, i in enumerate(pending, start=1)
             )
+            blocks: dict[int, str] = {}
+            try:
+                async with self._client_session() as client:
+                    response = await asyncio.wait_for(
+                        client.messages.create(
+                            model=self.model,
+                            max_tokens=self.max_tokens * len(pending),
+                            system=_SUMMARY_SYSTEM_PROMPT + "\n\n" + _BATCH_INSTRUCTIONS,
+                            messages=[{"role": "user", "content": prompt}],
+                        ),
+                        self.request_timeout,
+                    )
+                blocks = self._split_batch(response.content[0].text)
+            except Exception as e:
+                logger.warning("Claude API volání selhalo pro dávku %d témat: %s", len(pending), e)
+
+            for n, i in enumerate(pending, start=1):
+                label, articles, _ = groups[i]
+                if n in blocks:
+                    results[i] = self._accept_result(
+                        keys[i], self._parse_response(blocks[n]), label, articles
+                    )
+                else:
+                    results[i] = self._fallback_summary(label, articles)
 
-            text = response.content[0].text
-            return self._parse_response(text)
+        return results
 
-        except Exception as e:
-            logger.warning("Claude API volání selhalo pro '%s': %s", topic_label, e)
+    def _accept_result(
+        self, cache_key: str, result: dict, topic_label: str, articles: list[dict]
+    ) -> dict:
+        """Uloží rozparsovaný souhrn do cache.
+
+        Odpověď bez souhrnu (nerozparsovatelná / poškozený blok dávky) se necachuje –
+        jinak by se prázdný AI blok vracel až do vypršení TTL – a nahradí ji fallback.
+        """
+        if not result["summary"]:
+            logger.warning("Odpověď Claude pro '%s' neobsahuje souhrn, používám fallback", topic_label)
             return self._fallback_summary(topic_label, articles)
+        if self.cache is not None:
+            self.cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _split_batch(text: str) -> dict[int, str]:
+        """Rozdělí dávkovou odpověď podle značek "### TÉMA n ###" -> {n: text bloku}."""
+        parts = _BATCH_MARKER_RE.split(text)
+        # parts = [úvod, číslo, blok, číslo, blok, ...]
+        return {int(num): block for num, block in zip(parts[1::2], parts[2::2])}
+
+    def _topic_prompt(self, topic_label: str, articles: list[dict], category: str) -> str:
+        """Dynamická část promptu pro jedno téma (instrukce jsou v system promptu)."""
+        # Sestavení kontextu z článků
+        articles_text = "\n".join(
+            f"- {a.get('title', '')} ({a.get('source', '')})"
+            for a in articles[:15]
+        )
+
+        return f"""TÉMA: {topic_label}
+KATEGORIE: {category}
+
+ČLÁNKY:
+{articles_text}"""
 
     def summarize_all_clusters(
         self,
@@ -108,70 +345,213 @@ Jaký úhel pohledu zvolit? Co konkrétně rozebrat? (2-3 věty)"""
             logger.info("AI sumarizace je vypnutá")
             return clusters
 
-        if not self.client:
+        if not self.client_available:
             logger.warning("Claude API klient není k dispozici (chybí API klíč nebo knihovna)")
             return clusters
 
-        for cluster in clusters:
-            # Sesbírat články z clusteru
-            articles = []
-            cluster_categories: set[str] = set()
-
-            for idx in cluster.get("item_indices", []):
-                if idx < len(items):
-                    item = items[idx]
-                    articles.append(
-                        {
-                            "title": item.title,
-                            "url": item.url,
-                            "source": item.source,
-                            "description": item.description[:200],
-                        }
-                    )
-                    # Kategorie z mapy
-                    for cat in categories_map.get(idx, []):
-                        cluster_categories.add(cat.get("display_name", ""))
+        return asyncio.run(self.summarize_all_clusters_async(clusters, items, categories_map))
 
-            category_str = ", ".join(sorted(cluster_categories)) if cluster_categories else ""
+    def run_ai(
+        self,
+        clusters: list[dict],
+        items: list,
+        categories_map: dict[int, list[dict]],
+        metadata: dict,
+    ) -> tuple[list[dict], str]:
+        """Souhrny clusterů a úvod newsletteru souběžně.
 
-            # AI souhrn
-            summary = self.summarize_topic_group(
-                topic_label=cluster.get("label", ""),
-                articles=articles,
-                category=category_str,
-            )
+        Úvod potřebuje jen labely clusterů, které jsou známé předem –
+        jeho generování se tak překrývá se sumarizací clusterů.
+
+        Returns:
+            Tuple (clustery s AI souhrny, úvod newsletteru)
+        """
+        if not self.enabled:
+            logger.info("AI sumarizace je vypnutá")
+            return clusters, ""
+
+        if not self.client_available:
+            logger.warning("Claude API klient není k dispozici (chybí API klíč nebo knihovna)")
+            return clusters, ""
+
+        async def _run() -> tuple[list[dict], str]:
+            # Jeden klient pro obě úlohy
+            async with self._client_session():
+                intro_task = asyncio.create_task(
+                    self.generate_newsletter_intro_async(clusters, metadata)
+                )
+                summaries_task = asyncio.create_task(
+                    self.summarize_all_clusters_async(clusters, items, categories_map)
+                )
+                return tuple(await asyncio.gather(summaries_task, intro_task))
+
+        result = asyncio.run(_run())
+        # Úvod může doběhnout až po uložení cache v summarize_all_clusters_async
+        if self.cache is not None:
+            self.cache.save()
+        return result
 
+    async def summarize_all_clusters_async(
+        self,
+        clusters: list[dict],
+        items: list,
+        categories_map: dict[int, list[dict]],
+    ) -> list[dict]:
+        """Async varianta summarize_all_clusters – clustery se sumarizují souběžně.
+
+        Počet souběžných volání omezuje max_concurrency.
+        """
+        async with self._client_session():
+            return await self._summarize_all_clusters(clusters, items, categories_map)
+
+    async def _summarize_all_clusters(
+        self,
+        clusters: list[dict],
+        items: list,
+        categories_map: dict[int, list[dict]],
+    ) -> list[dict]:
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _summarize(cluster: dict) -> None:
+            articles, category_str = self._cluster_articles(cluster, items, categories_map)
+            async with sem:
+                summary = await self.summarize_topic_group_async(
+                    topic_label=cluster.get("label", ""),
+                    articles=articles,
+                    category=category_str,
+                )
             cluster["ai_summary"] = summary
             logger.debug("AI souhrn pro cluster '%s': hotovo", cluster.get("label", ""))
 
+        async def _summarize_batch(batch: list[dict]) -> None:
+            groups = [
+                (cluster.get("label", ""), *self._cluster_articles(cluster, items, categories_map))
+                for cluster in batch
+            ]
+            async with sem:
+                summaries = await self.summarize_topic_batch_async(groups)
+            for cluster, summary in zip(batch, summaries):
+                cluster["ai_summary"] = summary
+            logger.debug("AI souhrny pro dávku %d clusterů: hotovo", len(batch))
+
+        # Malé clustery po dávkách (jedno volání na dávku), ostatní samostatně
+        small = [c for c in clusters if c.get("size", 0) <= self.small_cluster_size]
+        large = [c for c in clusters if c.get("size", 0) > self.small_cluster_size]
+        batches = [small[i : i + self.batch_size] for i in range(0, len(small), self.batch_size)]
+
+        await asyncio.gather(
+            *(_summarize(cluster) for cluster in large),
+            *(_summarize_batch(batch) for batch in batches),
+        )
+        if self.cache is not None:
+            self.cache.save()
+
         logger.info("AI sumarizace dokončena pro %d clusterů", len(clusters))
         return clusters
 
+    def _cache_key(self, topic_label: str, articles: list[dict], category: str) -> str:
+        """Klíč cache – téma, URL článků, kategorie a parametry modelu."""
+        return content_key(
+            {
+                "label": topic_label,
+                "urls": sorted(a.get("url", "") for a in articles),
+                "cat": category,
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "v": 1,
+            }
+        )
+
+    def _intro_cache_key(self, cluster_labels: list[str], total_items: int, sources: list[str]) -> str:
+        """Klíč cache úvodu – témata dne, zdroje a počet článků po 50 (drobné rozdíly nevadí)."""
+        return content_key(
+            {
+                "kind": "intro",
+                "labels": sorted(cluster_labels),
+                "sources": sorted(sources),
+                "items_bucket": total_items // 50,
+                "model": self.model,
+                "v": 1,
+            }
+        )
+
+    def _cluster_articles(
+        self,
+        cluster: dict,
+        items: list,
+        categories_map: dict[int, list[dict]],
+    ) -> tuple[list[dict], str]:
+        """Sesbírá články a kategorie clusteru. Vrací (články, kategorie jako string)."""
+        items_len = len(items)
+        cluster_items = [
+            (idx, items[idx]) for idx in cluster.get("item_indices", []) if idx < items_len
+        ]
+        articles = [
+            {
+                "title": item.title,
+                "url": item.url,
+                "source": item.source,
+                "description": item.description[:200],
+            }
+            for _, item in cluster_items
+        ]
+
+        # Kategorie z mapy
+        get_categories = categories_map.get
+        cluster_categories = {
+            cat.get("display_name", "")
+            for idx, _ in cluster_items
+            for cat in get_categories(idx, ())
+        }
+
+        category_str = ", ".join(sorted(cluster_categories)) if cluster_categories else ""
+        return articles, category_str
+
     def generate_newsletter_intro(self, clusters: list[dict], metadata: dict) -> str:
+        """Synchronní wrapper nad generate_newsletter_intro_async."""
+        if not self.client_available:
+            return ""
+        intro = asyncio.run(self.generate_newsletter_intro_async(clusters, metadata))
+        if self.cache is not None:
+            self.cache.save()
+        return intro
+
+    async def generate_newsletter_intro_async(self, clusters: list[dict], metadata: dict) -> str:
         """Vygeneruje úvodní odstavec pro newsletter."""
-        if not self.client:
+        if not self.client_available:
             return ""
 
         cluster_labels = [c.get("label", "") for c in clusters[:10]]
         total_items = metadata.get("total_items", 0)
         sources = metadata.get("sources_used", [])
 
-        prompt = f"""Jsi editor denního newsletteru o trendech v digital marketingu, AI a analytics.
+        cache_key = self._intro_cache_key(cluster_labels, total_items, sources)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key, max_age=self.intro_cache_ttl)
+            if cached is not None:
+                logger.debug("Newsletter intro z cache")
+                return cached
 
-Dnes bylo analyzováno {total_items} článků z těchto zdrojů: {', '.join(sources)}.
+        prompt = f"""Dnes bylo analyzováno {total_items} článků z těchto zdrojů: {', '.join(sources)}.
 
 Hlavní témata dne:
-{chr(10).join(f'- {label}' for label in cluster_labels)}
-
-Napiš krátký úvodní odstavec (3-4 věty, česky) pro denní newsletter. Buď stručný, věcný a zajímavý. Zaměř se na to, co je dnes nejzajímavější a proč. Nepoužívej emoji."""
+{chr(10).join(f'- {label}' for label in cluster_labels)}"""
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            return response.content[0].text.strip()
+            async with self._client_session() as client:
+                response = await asyncio.wait_for(
+                    client.messages.create(
+                        model=self.model,
+                        max_tokens=300,
+                        system=_INTRO_SYSTEM_PROMPT,
+                        messages=[{"role": "user", "content": prompt}],
+                    ),
+                    self.request_timeout,
+                )
+            intro = response.content[0].text.strip()
+            if self.cache is not None and intro:
+                self.cache.set(cache_key, intro)
+            return intro
 
         except Exception as e:
             logger.warning("Generování newsletter intro selhalo: %s", e)
@@ -186,41 +566,19 @@ Napiš krátký úvodní odstavec (3-4 věty, česky) pro denní newsletter. Bu
             "article_angle": "",
         }
 
-        sections = {
-            "SOUHRN": "summary",
-            "PROČ JE TO DŮLEŽITÉ": "why_it_matters",
-            "NÁVRH ČLÁNKU - TITULEK": "article_idea",
-            "NÁVRH ČLÁNKU - ÚHEL": "article_angle",
-        }
+        # Začátky sekcí najde jediný průchod regexem; tělo sekce sahá po další hlavičku
+        matches = list(_SECTION_RE.finditer(text))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            # Tělo začíná až za koncem řádku hlavičky
+            lines = [line.strip() for line in text[match.end() + 1 : end].split("\n")]
+
+            # Pokud je na řádku hlavičky i text za dvojtečkou
+            after_colon = match.group(2).partition(":")[2].strip()
+            if after_colon:
+                lines.insert(0, after_colon)
 
-        current_key = None
-        current_lines: list[str] = []
-
-        for line in text.split("\n"):
-            line_stripped = line.strip()
-
-            # Kontrola, zda řádek začíná nějakou sekcí
-            matched = False
-            for section_name, key in sections.items():
-                if line_stripped.upper().startswith(section_name):
-                    # Uložit předchozí sekci
-                    if current_key:
-                        result[current_key] = "\n".join(current_lines).strip()
-                    current_key = key
-                    current_lines = []
-                    # Pokud je na řádku i text za dvojtečkou
-                    after_colon = line_stripped.split(":", 1)
-                    if len(after_colon) > 1 and after_colon[1].strip():
-                        current_lines.append(after_colon[1].strip())
-                    matched = True
-                    break
-
-            if not matched and current_key:
-                current_lines.append(line_stripped)
-
-        # Uložit poslední sekci
-        if current_key:
-            result[current_key] = "\n".join(current_lines).strip()
+            result[_SECTION_TO_KEY[match.group(1).upper()]] = "\n".join(lines).strip()
 
         return result
 
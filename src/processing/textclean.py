@@ -0,0 +1,43 @@
+"""Sdílené čištění textu před TF-IDF (extrakce klíčových slov i clustering)."""
+
+import html
+import re
+
+# HTML tagy | URL | hex kódy (6f6f6f) | krátké 1-2 znakové tokeny – jediný průchod textem
+_CLEAN_RE = re.compile(
+    r"(?P<tag><[^>]+>)|(?P<url>https?://[^\s<]+)|(?P<hex>\b[0-9a-f]{6}\b)|(?P<short>\b[a-z]{1,2}(?:\b|(?=https?://)))"
+)
+# Totéž bez krátkých tokenů – clustering je ve vlastních dokumentech ponechává
+_CLEAN_KEEP_SHORT_RE = re.compile(
+    r"(?P<tag><[^>]+>)|(?P<url>https?://[^\s<]+)|(?P<hex>\b[0-9a-f]{6}\b)"
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Krátké tokeny, které mají význam (AI/ML/PR/HR apod.)
+_KEEP_SHORT = frozenset({"ai", "ml", "hr", "pr", "ux", "ui", "qa", "ci", "cd"})
+
+
+def _clean_repl(match: re.Match) -> str:
+    """Nahradí nalezený artefakt mezerou; povolené krátké tokeny ponechá."""
+    short = match.group("short")
+    if short is not None and short in _KEEP_SHORT:
+        return short
+    return " "
+
+
+def normalize(text: str, drop_short: bool = True) -> str:
+    """Vyčistí text od HTML tagů, entit a přebytečných mezer.
+
+    Args:
+        drop_short: Odstranit i krátké 1-2 znakové tokeny (kromě _KEEP_SHORT)
+    """
+    # Dekódování HTML entit (&nbsp; &amp; atd.)
+    text = html.unescape(text)
+    # Odstranění HTML tagů, URL, hex kódů (a krátkých nesmyslných tokenů)
+    if drop_short:
+        text = _CLEAN_RE.sub(_clean_repl, text)
+    else:
+        text = _CLEAN_KEEP_SHORT_RE.sub(" ", text)
+    # Normalizace mezer
+    text = _WHITESPACE_RE.sub(" ", text)
+    return text.strip()
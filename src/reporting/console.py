@@ -1,11 +1,13 @@
 """Formátovaný výstup do konzole pomocí Rich."""
 
+import bisect
 import logging
 from datetime import date
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,18 @@ CATEGORY_COLORS = {
     "other": "white",
 }
 
+# Prahy trend score -> Rich styl (bisect místo if/elif v každém řádku)
+_SCORE_BUCKETS = [0.3, 0.5]
+_SCORE_STYLES = ["", "yellow", "green"]
+
+
+def _score_text(score: float) -> Text:
+    """Zformátuje score s barvou podle prahu (>= 0.5 zelená, >= 0.3 žlutá).
+
+    Buňky se stylem se předávají jako Text – Rich pak v každé buňce neparsuje markup.
+    """
+    return Text(f"{score:.3f}", style=_SCORE_STYLES[bisect.bisect_right(_SCORE_BUCKETS, score)])
+
 
 class ConsoleReporter:
     """Vypisuje formátovaný report do konzole."""
@@ -69,47 +83,38 @@ class ConsoleReporter:
     def _print_top_topics(self, topics: list[dict]) -> None:
         """Vypíše tabulku top trending topiků."""
         table = Table(title=f"Top {self.top_n} Trending Topics", border_style="blue")
-        table.add_column("#", style="dim", width=4)
+        table.add_column("#", style="dim", width=4, no_wrap=True)
         table.add_column("Keyword", style="bold", min_width=20)
-        table.add_column("Score", justify="right", width=8)
+        table.add_column("Score", justify="right", width=8, no_wrap=True)
         table.add_column("Category", min_width=15)
-        table.add_column("Mentions", justify="right", width=8)
+        table.add_column("Mentions", justify="right", width=8, no_wrap=True)
 
         if self.show_sources:
             table.add_column("Sources", min_width=15)
 
+        get_color = CATEGORY_COLORS.get
+        show_sources = self.show_sources
+
         for i, topic in enumerate(topics[: self.top_n], 1):
             # Kategorie s barvou
-            categories = topic.get("categories", [])
+            categories = topic.get("categories")
             if categories:
                 primary = categories[0]
-                cat_name = primary.get("display_name", primary.get("category", ""))
                 cat_key = primary.get("category", "other")
-                color = CATEGORY_COLORS.get(cat_key, "white")
-                cat_str = f"[{color}]{cat_name}[/{color}]"
-            else:
-                cat_str = "[dim]Other[/dim]"
-
-            # Score s barevným indikátorem
-            score = topic.get("trend_score", 0)
-            if score >= 0.5:
-                score_str = f"[green]{score:.3f}[/green]"
-            elif score >= 0.3:
-                score_str = f"[yellow]{score:.3f}[/yellow]"
+                cat_name = primary.get("display_name", primary.get("category", ""))
+                cat_cell = Text(cat_name, style=get_color(cat_key, "white"))
             else:
-                score_str = f"{score:.3f}"
+                cat_cell = Text("Other", style="dim")
 
-            row = [
+            row = (
                 str(i),
                 topic.get("keyword", ""),
-                score_str,
-                cat_str,
+                _score_text(topic.get("trend_score", 0)),
+                cat_cell,
                 str(topic.get("mention_count", 0)),
-            ]
-
-            if self.show_sources:
-                sources = topic.get("sources", [])
-                row.append(", ".join(sources))
+            )
+            if show_sources:
+                row += (", ".join(topic.get("sources", [])),)
 
             table.add_row(*row)
 
@@ -126,11 +131,12 @@ class ConsoleReporter:
 
         table = Table(title="Topics by Category", border_style="green")
         table.add_column("Category", style="bold", min_width=20)
-        table.add_column("Count", justify="right", width=8)
+        table.add_column("Count", justify="right", width=8, no_wrap=True)
         table.add_column("Top Keywords", min_width=40)
 
+        get_color = CATEGORY_COLORS.get
         for cat_key, cat_items in sorted(cat_topics.items(), key=lambda x: len(x[1]), reverse=True):
-            color = CATEGORY_COLORS.get(cat_key, "white")
+            color = get_color(cat_key, "white")
             # Display name z prvního topiku
             display_name = cat_key
             if cat_items and cat_items[0].get("categories"):
@@ -139,12 +145,10 @@ class ConsoleReporter:
                         display_name = c.get("display_name", cat_key)
                         break
 
-            top_kws = [t.get("keyword", "") for t in cat_items[:5]]
-
             table.add_row(
-                f"[{color}]{display_name}[/{color}]",
+                Text(display_name, style=color),
                 str(len(cat_items)),
-                ", ".join(top_kws),
+                ", ".join(t.get("keyword", "") for t in cat_items[:5]),
             )
 
         self.console.print(table)
@@ -152,9 +156,9 @@ class ConsoleReporter:
     def _print_clusters(self, clusters: list[dict]) -> None:
         """Vypíše přehled clusterů."""
         table = Table(title="Topic Clusters", border_style="yellow")
-        table.add_column("#", style="dim", width=4)
+        table.add_column("#", style="dim", width=4, no_wrap=True)
         table.add_column("Label", style="bold", min_width=25)
-        table.add_column("Size", justify="right", width=8)
+        table.add_column("Size", justify="right", width=8, no_wrap=True)
         table.add_column("Top Terms", min_width=30)
 
         for i, cluster in enumerate(clusters, 1):
@@ -1,5 +1,6 @@
 """Odesílání newsletter-style email reportů přes Gmail SMTP."""
 
+import functools
 import html
 import logging
 import re
@@ -18,12 +19,48 @@ _CAT_COLORS = {
     "other": ("#6b7280", "#f9fafb"),
 }
 
+# Heuristika kategorie sekce podle top_terms – jedna alternace na kategorii
+# (podřetězcové hledání, pořadí = priorita jako v _CAT_COLORS)
+_CAT_KEYWORD_RE = {
+    "marketing_digital": re.compile(r"marketing|seo|social|advertising"),
+    "ai_ml": re.compile(r"ai|llm|ml|generative"),
+    "data_analytics": re.compile(r"analytics|data|bigquery|ga4"),
+}
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_desc(raw: str) -> str:
+    """Zkrácený description bez HTML tagů (RSS položky se v clusterech opakují)."""
+    return html.unescape(_HTML_TAG_RE.sub("", raw)[:150]).strip()
+
 
 def _escape(text: str) -> str:
     """Escapuje HTML znaky v textu."""
     return html.escape(str(text)) if text else ""
 
 
+def _render_article(item) -> str:
+    """HTML blok jednoho článku (titulek s odkazem, zkrácený popis, zdroj)."""
+    source_badge = f'<span style="font-size:11px;color:#9ca3af;">{_escape(item.source)}</span>'
+    # Vyčistit description od HTML
+    desc = _clean_desc(item.description or "")
+
+    # Článek s odkazem nebo jen text (Google Trends bez URL)
+    if item.url:
+        title_html = f'<a href="{_escape(item.url)}" style="text-decoration:none;color:#1e40af;font-size:14px;font-weight:500;line-height:1.4;">{_escape(item.title)}</a>'
+    else:
+        title_html = f'<span style="font-size:14px;font-weight:500;line-height:1.4;color:#374151;">{_escape(item.title)}</span>'
+
+    return f"""
+<div style="padding:8px 0;border-bottom:1px solid #f3f4f6;">
+    {title_html}
+    {"<p style='margin:4px 0 0;font-size:12px;color:#6b7280;line-height:1.4;'>" + _escape(desc) + "</p>" if desc else ""}
+    <p style="margin:2px 0 0;">{source_badge}</p>
+</div>"""
+
+
 class EmailReporter:
     """Odesílá newsletter-style HTML email s AI souhrny a konkrétními články."""
 
@@ -66,16 +103,18 @@ class EmailReporter:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
         msg["From"] = self.sender
-        msg["To"] = ", ".join(self.recipients)
+        # Příjemci jdou jen v obálce (BCC) – navzájem své adresy nevidí
+        msg["To"] = self.sender
 
         msg.attach(MIMEText(text_body, "plain", "utf-8"))
         msg.attach(MIMEText(html_body, "html", "utf-8"))
+        raw_message = msg.as_string()
 
         try:
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 server.starttls()
                 server.login(self.sender, self.app_password)
-                server.sendmail(self.sender, self.recipients, msg.as_string())
+                server.sendmail(self.sender, self.recipients, raw_message)
 
             logger.info("Newsletter email odeslán na: %s", ", ".join(self.recipients))
             return True
@@ -105,9 +144,10 @@ class EmailReporter:
 </div>"""
 
         # Tematické sekce
-        sections_html = ""
-        for i, cluster in enumerate(clusters[:12]):
-            sections_html += self._build_topic_section(cluster, items, i)
+        sections_html = "".join(
+            self._build_topic_section(cluster, items, i)
+            for i, cluster in enumerate(clusters[:12])
+        )
 
         return f"""<!DOCTYPE html>
 <html>
@@ -140,17 +180,10 @@ class EmailReporter:
 
         # Určení barvy podle první nalezené kategorie
         color, bg_color = "#3b82f6", "#eff6ff"
-        for cat_key, (c, bg) in _CAT_COLORS.items():
-            # Heuristika: kontrola top_terms proti keywords
-            top_terms_str = " ".join(cluster.get("top_terms", []))
-            if cat_key == "ai_ml" and any(w in top_terms_str for w in ["ai", "llm", "ml", "generative"]):
-                color, bg_color = c, bg
-                break
-            elif cat_key == "data_analytics" and any(w in top_terms_str for w in ["analytics", "data", "bigquery", "ga4"]):
-                color, bg_color = c, bg
-                break
-            elif cat_key == "marketing_digital" and any(w in top_terms_str for w in ["marketing", "seo", "social", "advertising"]):
-                color, bg_color = c, bg
+        top_terms_str = " ".join(cluster.get("top_terms", []))
+        for cat_key, pattern in _CAT_KEYWORD_RE.items():
+            if pattern.search(top_terms_str):
+                color, bg_color = _CAT_COLORS[cat_key]
                 break
 
         # AI souhrn
@@ -160,11 +193,12 @@ class EmailReporter:
         article_angle = ai_summary.get("article_angle", "")
 
         # Sestavení AI bloku
-        ai_block = ""
+        ai_parts: list[str] = []
         if summary_text:
-            ai_block += f'<p style="margin:0 0 10px;font-size:14px;line-height:1.6;color:#374151;">{_escape(summary_text)}</p>'
+            ai_parts.append(f'<p style="margin:0 0 10px;font-size:14px;line-height:1.6;color:#374151;">{_escape(summary_text)}</p>')
         if why_matters:
-            ai_block += f'<p style="margin:0 0 10px;font-size:13px;line-height:1.5;color:#6b7280;"><strong style="color:#374151;">Proč je to důležité:</strong> {_escape(why_matters)}</p>'
+            ai_parts.append(f'<p style="margin:0 0 10px;font-size:13px;line-height:1.5;color:#6b7280;"><strong style="color:#374151;">Proč je to důležité:</strong> {_escape(why_matters)}</p>')
+        ai_block = "".join(ai_parts)
 
         # Návrh článku
         article_block = ""
@@ -176,36 +210,18 @@ class EmailReporter:
     {"<p style='margin:0;font-size:13px;color:#78716c;line-height:1.5;'>" + _escape(article_angle) + "</p>" if article_angle else ""}
 </div>"""
 
-        # Konkrétní články z clusteru
+        # Konkrétní články z clusteru – filtr i vykreslení v jednom průchodu (max 6 z prvních 8)
         articles_html = ""
-        article_items = []
+        items_len = len(items)
+        article_parts = []
         for idx in cluster.get("item_indices", [])[:8]:
-            if idx < len(items):
-                item = items[idx]
-                if item.title:
-                    article_items.append(item)
-
-        if article_items:
-            articles_html = '<div style="margin-top:12px;">'
-            for item in article_items[:6]:
-                source_badge = f'<span style="font-size:11px;color:#9ca3af;">{_escape(item.source)}</span>'
-                # Vyčistit description od HTML
-                desc = re.sub(r"<[^>]+>", "", item.description or "")[:150]
-                desc = html.unescape(desc).strip()
-
-                # Článek s odkazem nebo jen text (Google Trends bez URL)
-                if item.url:
-                    title_html = f'<a href="{_escape(item.url)}" style="text-decoration:none;color:#1e40af;font-size:14px;font-weight:500;line-height:1.4;">{_escape(item.title)}</a>'
-                else:
-                    title_html = f'<span style="font-size:14px;font-weight:500;line-height:1.4;color:#374151;">{_escape(item.title)}</span>'
-
-                articles_html += f"""
-<div style="padding:8px 0;border-bottom:1px solid #f3f4f6;">
-    {title_html}
-    {"<p style='margin:4px 0 0;font-size:12px;color:#6b7280;line-height:1.4;'>" + _escape(desc) + "</p>" if desc else ""}
-    <p style="margin:2px 0 0;">{source_badge}</p>
-</div>"""
-            articles_html += "</div>"
+            if idx < items_len and items[idx].title:
+                article_parts.append(_render_article(items[idx]))
+                if len(article_parts) == 6:
+                    break
+
+        if article_parts:
+            articles_html = f'<div style="margin-top:12px;">{"".join(article_parts)}</div>'
 
         return f"""
 <div style="margin-bottom:28px;border:1px solid #e5e7eb;border-radius:12px;overflow:hidden;">
@@ -1,10 +1,18 @@
 """Deduplikace článků přes BigQuery – ukládá URL již poslaných článků."""
 
 import hashlib
+import io
+import json
 import logging
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
 from typing import Optional
 
+from src.storage.bloom import BloomFilter
+from src.storage.jsonio import dump_json, load_json
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -15,6 +23,12 @@ except ImportError:
     BQ_AVAILABLE = False
 
 
+# Streaming insert po dávkách – BigQuery doporučuje do ~500 řádků na request
+_INSERT_CHUNK_ROWS = 500
+_INSERT_WORKERS = 4
+# Od tohoto počtu řádků se místo streaming insertu použije load job
+_LOAD_JOB_MIN_ROWS = 5000
+
 # SQL pro vytvoření tabulky (spustí se automaticky při prvním běhu)
 _CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS `{dataset}.sent_articles` (
@@ -32,16 +46,61 @@ OPTIONS(
 """
 
 
+def _url_hashes_batch(urls: list[str]) -> list[str]:
+    """MD5 hex hashe pro celý seznam URL najednou (bez volání metody per URL)."""
+    md5 = hashlib.md5
+    return [md5(url.encode("utf-8")).hexdigest() for url in urls]
+
+
 class BigQueryDedup:
     """Sleduje již odeslané články v BigQuery pro deduplikaci."""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, data_dir: Optional[Path] = None):
+        """
+        Args:
+            config: Konfigurace aplikace
+            data_dir: Adresář pro lokální Bloom filtr odeslaných URL (None = bez filtru)
+        """
         bq_config = config.get("bigquery", {})
         self.enabled: bool = bq_config.get("enabled", False)
         self.project: str = bq_config.get("project", "")
         self.dataset: str = bq_config.get("dataset", "newsletter_scanner")
         self.client: Optional[object] = None
 
+        # Výsledky get_sent_urls pro dnešek ({days: hashe}), zrcadlené na disk – další běh téhož dne
+        # se BigQuery neptá
+        self.sent_cache_file: Optional[Path] = (
+            Path(data_dir) / "sent_urls_cache.json" if data_dir else None
+        )
+        self._sent_cache_synced_at: Optional[float] = None
+        self._sent_cache: dict[int, set[str]] = self._load_sent_cache()
+        # Do sent_articles zapisuje víc instancí (Cloud Run job i lokální Task Scheduler) –
+        # lokální stav se jednou za běh doplní o jejich odeslání (_sync_recent)
+        self._started_at = time.time()
+        self._synced = False
+        # Výsledek was_sent_today – v rámci procesu se ptáme jen jednou
+        self._sent_today: Optional[bool] = None
+
+        # Bloom filtr odeslaných URL hashů – autoritativní až po naplnění z BigQuery
+        # a synchronizaci s odesláními ostatních instancí (_sync_recent)
+        self.bloom_file: Optional[Path] = Path(data_dir) / "sent_urls.bloom" if data_dir else None
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_ready = False
+        # Filtr jen přibývá – po bloom_rebuild_days se zahodí a znovu naplní z okna dedup_days,
+        # aby v něm nezůstávaly dávno vypršelé URL (a nerostla false-positive rate)
+        self.bloom_rebuild_days: float = bq_config.get("bloom_rebuild_days", 7)
+        if self.bloom_file:
+            self._bloom = BloomFilter.load(self.bloom_file)
+            if self._bloom is not None and self._bloom_expired(self._bloom):
+                logger.info(
+                    "Bloom filtr odeslaných URL je starší než %s dní – obnoví se",
+                    self.bloom_rebuild_days,
+                )
+                self._bloom = None
+            self._bloom_ready = self._bloom is not None
+            if self._bloom is None:
+                self._bloom = BloomFilter()
+
         if self.enabled and BQ_AVAILABLE and self.project:
             try:
                 self.client = bigquery.Client(project=self.project)
@@ -51,6 +110,46 @@ class BigQueryDedup:
                 logger.error("BigQuery inicializace selhala: %s", e)
                 self.client = None
 
+    def _load_sent_cache(self) -> dict[int, set[str]]:
+        """Načte dnešní cache odeslaných hashů (cache z jiného dne se ignoruje)."""
+        if not self.sent_cache_file or not self.sent_cache_file.exists():
+            return {}
+
+        try:
+            cache = load_json(self.sent_cache_file)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Chyba při načítání cache odeslaných URL: %s", e)
+            return {}
+
+        if cache.get("date") != date.today().isoformat():
+            return {}
+        # Starší cache bez synced_at – synchronizuje se od začátku dne
+        self._sent_cache_synced_at = cache.get("synced_at", 0.0)
+        return {int(days): set(hashes) for days, hashes in cache.get("windows", {}).items()}
+
+    def _save_sent_cache(self) -> None:
+        """Uloží cache odeslaných hashů s dnešním datem."""
+        if not self.sent_cache_file:
+            return
+        self.sent_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(
+            {
+                "date": date.today().isoformat(),
+                "synced_at": self._sent_cache_synced_at,
+                "windows": {str(days): sorted(hashes) for days, hashes in self._sent_cache.items()},
+            },
+            self.sent_cache_file,
+            indent=False,
+        )
+
+    def _bloom_expired(self, bloom: BloomFilter) -> bool:
+        """Byl Bloom filtr postaven před víc než bloom_rebuild_days?
+
+        Rozhoduje čas vytvoření z hlavičky souboru, ne mtime – ten se posouvá
+        při každém mark_sent, takže by denně spouštěný job filtr nikdy neobnovil.
+        """
+        return time.time() - bloom.created_at > self.bloom_rebuild_days * 86400
+
     def _ensure_table(self) -> None:
         """Vytvoří dataset a tabulku pokud neexistují."""
         if not self.client:
@@ -70,52 +169,183 @@ class BigQueryDedup:
         sql = _CREATE_TABLE_SQL.format(dataset=f"{self.project}.{self.dataset}")
         self.client.query(sql).result()
 
-    def _url_hash(self, url: str) -> str:
-        """Vytvoří hash z URL pro rychlé porovnání."""
-        return hashlib.md5(url.encode("utf-8")).hexdigest()
-
     def get_sent_urls(self, days: int = 7) -> set[str]:
-        """Vrátí set URL hashů článků odeslaných za posledních N dní."""
+        """Vrátí set URL hashů článků odeslaných za posledních N dní (v rámci dne z cache)."""
         if not self.client:
             return set()
 
+        if days in self._sent_cache:
+            return self._sent_cache[days]
+
         sql = f"""
-        SELECT url_hash
+        SELECT DISTINCT url_hash
         FROM `{self.project}.{self.dataset}.sent_articles`
         WHERE sent_date >= DATE_SUB(CURRENT_DATE(), INTERVAL {days} DAY)
         """
 
         try:
+            queried_at = time.time()
             result = self.client.query(sql).result()
             hashes = {row.url_hash for row in result}
             logger.info("BigQuery: načteno %d již odeslaných článků", len(hashes))
+            # Čas synchronizace cache = nejstarší z oken; nové okno ho posune jen v prázdné cache
+            if not self._sent_cache:
+                self._sent_cache_synced_at = queried_at
+            self._sent_cache[days] = hashes
+            self._save_sent_cache()
             return hashes
         except Exception as e:
             logger.warning("BigQuery čtení selhalo: %s", e)
             return set()
 
+    def _sync_recent(self) -> bool:
+        """Doplní do Bloom filtru a cache odeslaných hashe odeslané od poslední synchronizace.
+
+        Lokální stav zná jen odeslání z tohoto stroje – články odeslané jinou instancí
+        (do stejné tabulky) v něm chybí. Negativní odpověď filtru / cache proto platí
+        až po synchronizaci. Stahují se jen řádky od posledního dne synchronizace
+        (s dnem rezervy kvůli rozdílným časovým zónám instancí), jednou za běh.
+
+        Returns:
+            True, pokud je lokální stav aktuální. Při chybě se cache zahodí a False
+            znamená, že negativním odpovědím filtru nelze věřit.
+        """
+        if self._synced:
+            return True
+
+        marks = []
+        if self._bloom_ready:
+            marks.append(self._bloom.synced_at)
+        if self._sent_cache:
+            marks.append(self._sent_cache_synced_at or 0.0)
+        # Nic lokálního, nebo vše načtené z BigQuery až v tomto běhu
+        if not marks or min(marks) >= self._started_at:
+            self._synced = True
+            return True
+
+        since = date.fromtimestamp(min(marks)) - timedelta(days=1)
+        sql = f"""
+        SELECT DISTINCT url_hash
+        FROM `{self.project}.{self.dataset}.sent_articles`
+        WHERE sent_date >= @since
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("since", "DATE", since)]
+        )
+
+        try:
+            synced_at = time.time()
+            result = self.client.query(sql, job_config=job_config).result()
+            hashes = [row.url_hash for row in result]
+        except Exception as e:
+            logger.warning("BigQuery synchronizace odeslaných URL selhala: %s", e)
+            self._sent_cache = {}
+            return False
+
+        logger.info("BigQuery: synchronizováno %d odeslaných článků od %s", len(hashes), since)
+        if self._bloom_ready:
+            self._bloom.update(hashes)
+            self._bloom.synced_at = synced_at
+            self._bloom.save(self.bloom_file)
+        if self._sent_cache:
+            for window in self._sent_cache.values():
+                window.update(hashes)
+            self._sent_cache_synced_at = synced_at
+            self._save_sent_cache()
+        self._synced = True
+        return True
+
+    def get_new_hashes(self, url_hashes: list[str], days: int = 7) -> set[str]:
+        """Vrátí hashe z url_hashes, které za posledních N dní nebyly odeslány.
+
+        Rozdíl množin počítá BigQuery (anti-join proti sent_articles) –
+        po síti jdou jen kandidáti tam a nové hashe zpět.
+        """
+        if not self.client or not url_hashes:
+            return set(url_hashes)
+
+        # Celý set je dnes už načtený – rozdíl stačí spočítat lokálně
+        if days in self._sent_cache:
+            sent_hashes = self._sent_cache[days]
+            return {h for h in url_hashes if h not in sent_hashes}
+
+        sql = f"""
+        SELECT h
+        FROM UNNEST(@hashes) AS h
+        LEFT JOIN (
+            SELECT DISTINCT url_hash
+            FROM `{self.project}.{self.dataset}.sent_articles`
+            WHERE sent_date >= DATE_SUB(CURRENT_DATE(), INTERVAL @days DAY)
+        ) AS s
+        ON s.url_hash = h
+        WHERE s.url_hash IS NULL
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter("hashes", "STRING", url_hashes),
+                bigquery.ScalarQueryParameter("days", "INT64", days),
+            ]
+        )
+
+        try:
+            result = self.client.query(sql, job_config=job_config).result()
+            new_hashes = {row.h for row in result}
+            logger.info(
+                "BigQuery: %d z %d kandidátů ještě nebylo odesláno", len(new_hashes), len(url_hashes)
+            )
+            return new_hashes
+        except Exception as e:
+            logger.warning("BigQuery čtení selhalo: %s", e)
+            return set(url_hashes)
+
     def was_sent_today(self) -> bool:
         """Zkontroluje, jestli už byl dnes odeslán newsletter."""
         if not self.client:
             return False
+        if self._sent_today is not None:
+            return self._sent_today
 
+        # Stačí existence jednoho řádku – LIMIT 1 místo COUNT(*) přes celou partition
         sql = f"""
-        SELECT COUNT(*) as cnt
+        SELECT 1
         FROM `{self.project}.{self.dataset}.sent_articles`
         WHERE sent_date = CURRENT_DATE()
+        LIMIT 1
         """
 
         try:
             result = self.client.query(sql).result()
-            count = list(result)[0].cnt
-            if count > 0:
-                logger.info("BigQuery: dnes už bylo odesláno %d článků – přeskakuji", count)
-                return True
-            return False
+            self._sent_today = bool(list(result))
         except Exception as e:
             logger.warning("BigQuery kontrola dnešního odeslání selhala: %s", e)
             return False
 
+        if self._sent_today:
+            logger.info("BigQuery: dnes už byl newsletter odeslán – přeskakuji")
+        return self._sent_today
+
+    def prefetch(self, days: int = 7) -> tuple[bool, set[str]]:
+        """Spustí úvodní dotazy do BigQuery souběžně (ve vláknech) a výsledky si zapamatuje.
+
+        Kontrola dnešního odeslání a stažení odeslaných hashů jsou nezávislé round-tripy –
+        překryjí se místo čekání za sebou. Hashe se stahují jen tehdy, když je
+        filter_new bude potřebovat (první běh bez naplněného Bloom filtru).
+
+        Returns:
+            Tuple (dnes už odesláno, set odeslaných hashů – prázdný, pokud se nestahoval)
+        """
+        if not self.client:
+            return False, set()
+
+        need_sent = self._bloom is not None and not self._bloom_ready
+        if not need_sent:
+            return self.was_sent_today(), set()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sent_today = executor.submit(self.was_sent_today)
+            sent_hashes = executor.submit(self.get_sent_urls, days)
+            return sent_today.result(), sent_hashes.result()
+
     def filter_new(self, items: list, days: int = 7) -> list:
         """Odfiltruje již odeslané články. Vrací jen nové.
 
@@ -126,17 +356,42 @@ class BigQueryDedup:
         Returns:
             Seznam FetchedItem, které ještě nebyly odeslány
         """
-        if not self.client:
+        # Bez klienta nebo bez položek není co kontrolovat – žádný dotaz do BigQuery
+        if not self.client or not items:
             return items
 
-        sent_hashes = self.get_sent_urls(days)
-        if not sent_hashes:
-            return items
+        hashes = _url_hashes_batch([item.url for item in items])
+
+        # Nejdřív doplnit odeslání z jiných instancí – bez toho negativní odpověď filtru neplatí
+        synced = self._sync_recent()
+
+        # Bloom filtr: negativní odpověď = určitě neodesláno, BigQuery není potřeba
+        maybe_seen = [True] * len(items)
+        if self._bloom_ready and synced:
+            maybe_seen = [h in self._bloom for h in hashes]
+            if not any(maybe_seen):
+                logger.info("Deduplikace: Bloom filtr – všech %d článků je nových", len(items))
+                return items
+
+        if self._bloom is not None and not self._bloom_ready:
+            # První běh bez lokálního filtru – stáhnout všechny hashe a naplnit ho z BigQuery
+            sent_hashes = self.get_sent_urls(days)
+            if not sent_hashes:
+                return items
+            self._bloom.update(sent_hashes)
+            self._bloom.synced_at = self._sent_cache_synced_at or time.time()
+            self._bloom.save(self.bloom_file)
+            self._bloom_ready = True
+            new_hashes = {h for h in hashes if h not in sent_hashes}
+        else:
+            # Jen kandidáti (pozitivní v Bloom filtru) – rozdíl spočítá BigQuery
+            candidates = sorted({h for h, maybe in zip(hashes, maybe_seen) if maybe})
+            new_hashes = self.get_new_hashes(candidates, days)
 
         new_items = []
         skipped = 0
-        for item in items:
-            if self._url_hash(item.url) not in sent_hashes:
+        for item, url_hash, maybe in zip(items, hashes, maybe_seen):
+            if not maybe or url_hash in new_hashes:
                 new_items.append(item)
             else:
                 skipped += 1
@@ -159,40 +414,88 @@ class BigQueryDedup:
             return
 
         # Sestavení mapování item_index -> cluster_label
-        index_to_cluster: dict[int, str] = {}
-        for cluster in clusters:
-            label = cluster.get("label", "")
-            for idx in cluster.get("item_indices", []):
-                index_to_cluster[idx] = label
-
-        # Sestavení řádků pro insert
-        rows = []
-        today = datetime.now().strftime("%Y-%m-%d")
-
-        for i, item in enumerate(items):
-            if not item.url:
-                continue
-            rows.append(
-                {
-                    "url_hash": self._url_hash(item.url),
-                    "url": item.url[:1000],
-                    "title": (item.title or "")[:500],
-                    "source": item.source,
-                    "sent_date": today,
-                    "cluster_label": index_to_cluster.get(i, ""),
-                }
-            )
+        index_to_cluster = {
+            idx: cluster.get("label", "")
+            for cluster in clusters
+            for idx in cluster.get("item_indices", [])
+        }
+        get_label = index_to_cluster.get
+
+        # Sestavení řádků pro insert (hashe jedním dávkovým voláním)
+        today = date.today().isoformat()
+        sent = [(i, item) for i, item in enumerate(items) if item.url]
+        hashes = _url_hashes_batch([item.url for _, item in sent])
+
+        rows = [
+            {
+                "url_hash": url_hash,
+                "url": item.url[:1000],
+                "title": (item.title or "")[:500],
+                "source": item.source,
+                "sent_date": today,
+                "cluster_label": get_label(i, ""),
+            }
+            for (i, item), url_hash in zip(sent, hashes)
+        ]
 
         if not rows:
             return
 
-        # Batch insert
         table_ref = f"{self.project}.{self.dataset}.sent_articles"
+
+        # Velké dávky jedním load jobem (levnější a rychlejší než streaming insert)
+        if len(rows) >= _LOAD_JOB_MIN_ROWS and self._load_rows(table_ref, rows):
+            logger.info("BigQuery: uloženo %d odeslaných článků (load job)", len(rows))
+            self._record_sent([row["url_hash"] for row in rows])
+            return
+
+        # Streaming insert po dávkách (doporučená velikost requestu), dávky souběžně
+        chunks = [rows[i : i + _INSERT_CHUNK_ROWS] for i in range(0, len(rows), _INSERT_CHUNK_ROWS)]
+        with ThreadPoolExecutor(max_workers=min(_INSERT_WORKERS, len(chunks))) as executor:
+            results = list(executor.map(lambda chunk: self._insert_chunk(table_ref, chunk), chunks))
+
+        inserted = [row for chunk, ok in zip(chunks, results) if ok for row in chunk]
+        if not inserted:
+            return
+        logger.info("BigQuery: uloženo %d z %d odeslaných článků", len(inserted), len(rows))
+        self._record_sent([row["url_hash"] for row in inserted])
+
+    def _record_sent(self, url_hashes: list[str]) -> None:
+        """Promítne nově uložené hashe do Bloom filtru a cache odeslaných URL."""
+        self._sent_today = True
+        if self._bloom_ready:
+            self._bloom.update(url_hashes)
+            self._bloom.save(self.bloom_file)
+        # Dnes odeslané patří do každého okna – cache se doplní místo zahození
+        if self._sent_cache:
+            for hashes in self._sent_cache.values():
+                hashes.update(url_hashes)
+            self._save_sent_cache()
+
+    def _load_rows(self, table_ref: str, rows: list[dict]) -> bool:
+        """Nahraje řádky load jobem (NDJSON). Vrací True při úspěchu, jinak fallback na insert."""
+        buffer = io.BytesIO(
+            b"".join(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n" for row in rows)
+        )
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+        )
+        try:
+            self.client.load_table_from_file(buffer, table_ref, job_config=job_config).result()
+            return True
+        except Exception as e:
+            logger.warning("BigQuery load job selhal, fallback na streaming insert: %s", e)
+            return False
+
+    def _insert_chunk(self, table_ref: str, rows: list[dict]) -> bool:
+        """Vloží jednu dávku řádků streaming insertem. Vrací True při úspěchu."""
         try:
             errors = self.client.insert_rows_json(table_ref, rows)
-            if errors:
-                logger.warning("BigQuery insert chyby: %s", errors[:3])
-            else:
-                logger.info("BigQuery: uloženo %d odeslaných článků", len(rows))
         except Exception as e:
             logger.error("BigQuery insert selhal: %s", e)
+            return False
+        if errors:
+            logger.warning("BigQuery insert chyby: %s", errors[:3])
+            return False
+        return True
@@ -0,0 +1,85 @@
+"""Jednoduchý Bloom filter pro rychlé předfiltrování již viděných URL."""
+
+import hashlib
+import logging
+import math
+import struct
+import time
+from pathlib import Path
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Hlavička souboru: magic + čas vytvoření a poslední synchronizace filtru (Unix timestamp)
+_MAGIC = b"BLM1"
+_HEADER = struct.Struct("<4sdd")
+
+
+class BloomFilter:
+    """Pravděpodobnostní množina – negativní odpověď je jistá, pozitivní je nutné ověřit.
+
+    Bitové pole se ukládá binárně na disk, parametry určuje konstruktor.
+    Soubor nese i čas vytvoření filtru – přidávání klíčů (a přepis souboru)
+    ho nemění, takže podle něj lze filtr po čase zahodit a postavit znovu –
+    a čas poslední synchronizace se zdrojem dat (nastavuje volající).
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 1e-6):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.created_at: float = time.time()
+        self.synced_at: float = self.created_at
+        # Optimální velikost pole a počet hashovacích funkcí
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        """Double hashing – k pozic odvozených z jednoho SHA1 digestu."""
+        digest = hashlib.sha1(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        """Přidá klíč do filtru."""
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Přidá více klíčů najednou."""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, path: Path) -> None:
+        """Uloží hlavičku a bitové pole do souboru."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(_HEADER.pack(_MAGIC, self.created_at, self.synced_at) + bytes(self._bits))
+
+    @classmethod
+    def load(
+        cls, path: Path, capacity: int = 100_000, error_rate: float = 1e-6
+    ) -> "BloomFilter | None":
+        """Načte filtr ze souboru. Vrací None, pokud soubor chybí nebo nesedí parametry."""
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        bloom = cls(capacity, error_rate)
+        try:
+            data = path.read_bytes()
+        except IOError as e:
+            logger.warning("Chyba při načítání Bloom filtru: %s", e)
+            return None
+
+        if len(data) != _HEADER.size + len(bloom._bits) or not data.startswith(_MAGIC):
+            logger.warning("Bloom filtr %s má nekompatibilní formát – ignoruji", path)
+            return None
+
+        _, bloom.created_at, bloom.synced_at = _HEADER.unpack_from(data)
+        bloom._bits = bytearray(data[_HEADER.size :])
+        return bloom
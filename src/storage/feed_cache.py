@@ -0,0 +1,98 @@
+"""Cache HTTP validátorů RSS feedů – nezměněné feedy se nestahují ani neparsují znovu."""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from src.storage.jsonio import dump_json, load_json
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """Ukládá ETag / Last-Modified a naparsované entries per URL feedu.
+
+    Při dalším běhu se posílá podmíněný request; na 304 Not Modified
+    se vrátí entries z cache bez parsování XML.
+    Soubor: data/feed_cache.json
+    """
+
+    def __init__(self, data_dir: Path):
+        self.cache_file = Path(data_dir) / "feed_cache.json"
+        self._cache: dict[str, dict] = self._load()
+        # Feedy se stahují paralelně z více vláken
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        """Načte cache z JSON souboru."""
+        if not self.cache_file.exists():
+            return {}
+
+        try:
+            return load_json(self.cache_file)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Chyba při načítání feed cache: %s", e)
+            return {}
+
+    def save(self) -> None:
+        """Uloží cache do JSON souboru (jen pokud se změnila)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            dump_json(self._cache, self.cache_file, indent=False)
+            self._dirty = False
+
+    def get(self, url: str) -> dict | None:
+        """Vrátí záznam feedu: {"etag", "last_modified", "feed_title", "entries"} (nebo None)."""
+        with self._lock:
+            record = self._cache.get(url)
+        if record is None:
+            return None
+
+        entries = []
+        for entry in record.get("entries", []):
+            published = entry.get("published")
+            try:
+                published = datetime.fromisoformat(published) if published else None
+            except ValueError:
+                published = None
+            entries.append({**entry, "published": published})
+
+        return {
+            "etag": record.get("etag"),
+            "last_modified": record.get("last_modified"),
+            "feed_title": record.get("feed_title", ""),
+            "entries": entries,
+        }
+
+    def put(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        feed_title: str,
+        entries: list[dict],
+    ) -> None:
+        """Uloží validátory a entries feedu. Bez ETag i Last-Modified nemá cache smysl."""
+        if not etag and not last_modified:
+            return
+
+        record = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "feed_title": feed_title,
+            "entries": [
+                {
+                    **entry,
+                    "published": entry["published"].isoformat() if entry.get("published") else None,
+                }
+                for entry in entries
+            ],
+        }
+        with self._lock:
+            self._cache[url] = record
+            self._dirty = True
@@ -5,6 +5,8 @@ import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
+from src.storage.jsonio import dump_json, load_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +20,7 @@ class FetchCache:
     def __init__(self, data_dir: Path):
         self.cache_file = Path(data_dir) / "fetch_cache.json"
         self._cache: dict[str, str] = self._load()
+        self._dirty = False
 
     def _load(self) -> dict[str, str]:
         """Načte cache z JSON souboru."""
@@ -25,18 +28,18 @@ class FetchCache:
             return {}
 
         try:
-            with open(self.cache_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json(self.cache_file)
         except (json.JSONDecodeError, IOError) as e:
             logger.warning("Chyba při načítání fetch cache: %s", e)
             return {}
 
     def save(self) -> None:
-        """Uloží cache do JSON souboru."""
+        """Uloží cache do JSON souboru (jen pokud se změnila)."""
+        if not self._dirty:
+            return
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(self.cache_file, "w", encoding="utf-8") as f:
-            json.dump(self._cache, f, ensure_ascii=False, indent=2)
+        dump_json(self._cache, self.cache_file, indent=False)
+        self._dirty = False
 
     def get_last_run(self, source_name: str) -> datetime | None:
         """Vrátí datetime posledního běhu pro daný zdroj (nebo None)."""
@@ -50,9 +53,9 @@ class FetchCache:
             return None
 
     def update(self, source_name: str) -> None:
-        """Zaznamená aktuální čas jako poslední běh pro daný zdroj."""
+        """Zaznamená aktuální čas jako poslední běh pro daný zdroj (uloží až save())."""
         self._cache[source_name] = datetime.now(tz=timezone.utc).isoformat()
-        self.save()
+        self._dirty = True
         logger.debug("Fetch cache aktualizován: %s", source_name)
 
     def filter_new_items(self, items: list, source_name: str) -> list:
@@ -70,17 +73,16 @@ class FetchCache:
             # První běh – vrátíme vše
             return items
 
-        new_items = []
-        skipped = 0
-
-        for item in items:
-            if item.published is None:
-                # Nemá datum – ponecháme (raději víc než míň)
-                new_items.append(item)
-            elif item.published > last_run:
-                new_items.append(item)
-            else:
-                skipped += 1
+        # Porovnání epoch floatů místo datetime (bez převodu časových zón u každé položky)
+        if last_run.tzinfo is None:
+            last_run = last_run.replace(tzinfo=timezone.utc)
+        last_run_ts = last_run.timestamp()
+
+        # Položky bez data ponecháme (raději víc než míň)
+        new_items = [
+            item for item in items if (ts := item.published_ts) is None or ts > last_run_ts
+        ]
+        skipped = len(items) - len(new_items)
 
         if skipped > 0:
             logger.info(
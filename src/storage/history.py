@@ -6,37 +6,129 @@ from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
+from src.storage.jsonio import dumps, load_json, loads, write_atomic
+
 logger = logging.getLogger(__name__)
 
 
 class HistoryTracker:
-    """Správa historie běhů pro sledování vývoje trendů."""
+    """Správa historie běhů pro sledování vývoje trendů.
+
+    Soubor: data/history.ndjson – jeden běh na řádek, nový běh se jen připíše na konec.
+    Starší data/history.json se při prvním načtení převede.
+    """
 
     def __init__(self, data_dir: Path):
-        self.history_file = Path(data_dir) / "history.json"
+        self.history_file = Path(data_dir) / "history.ndjson"
+        self.legacy_file = Path(data_dir) / "history.json"
+        # Soubor nekončí novým řádkem (přerušený zápis) – další záznam musí začít na novém řádku
+        self._needs_newline = False
         self.history: list[dict] = self._load()
+        self._build_index()
 
     def _load(self) -> list[dict]:
-        """Načte historii z JSON souboru."""
+        """Načte historii z NDJSON souboru (případně převede starý JSON)."""
         if not self.history_file.exists():
+            return self._migrate_legacy()
+
+        try:
+            data = self.history_file.read_bytes()
+        except IOError as e:
+            logger.error("Chyba při načítání historie: %s", e)
+            return []
+
+        self._needs_newline = bool(data) and not data.endswith(b"\n")
+        history = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                history.append(loads(line))
+            except json.JSONDecodeError as e:
+                # Např. nedopsaný poslední řádek po přerušeném běhu
+                logger.warning("Přeskakuji poškozený záznam historie: %s", e)
+        return history
+
+    def _migrate_legacy(self) -> list[dict]:
+        """Převede starý history.json (celý seznam) na NDJSON."""
+        if not self.legacy_file.exists():
             return []
 
         try:
-            with open(self.history_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            history = load_json(self.legacy_file)
         except (json.JSONDecodeError, IOError) as e:
             logger.error("Chyba při načítání historie: %s", e)
             return []
 
+        self.history = history
+        self.save()
+        logger.info("Historie převedena do %s", self.history_file)
+        return history
+
     def save(self) -> None:
-        """Uloží historii do JSON souboru."""
+        """Přepíše celý NDJSON soubor historie."""
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(self.history_file, "w", encoding="utf-8") as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=2)
+        write_atomic(self.history_file, b"".join(dumps(run) + b"\n" for run in self.history))
+        self._needs_newline = False
 
         logger.info("Historie uložena: %d záznamů", len(self.history))
 
+    def _append(self, run_record: dict) -> None:
+        """Připíše jeden běh na konec souboru – bez přepisu celé historie."""
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history_file, "ab") as f:
+            if self._needs_newline:
+                f.write(b"\n")
+                self._needs_newline = False
+            f.write(dumps(run_record) + b"\n")
+
+    def _build_index(self) -> None:
+        """Zploští výskyty klíčových slov ze všech běhů do paralelních polí (jeden průchod).
+
+        Dotazy pak agregují přes NumPy masky a bincount místo vnořených smyček přes běhy.
+        Id klíčového slova = pořadí jeho prvního výskytu v historii.
+        """
+        self._dates: list[str] = []
+        self._kw_names: list[str] = []
+        self._kw_ids: dict[str, int] = {}
+        self._occ_kw: list[int] = []        # Id klíčového slova výskytu
+        self._occ_run: list[int] = []       # Index běhu výskytu
+        self._occ_score: list[float] = []   # trend_score výskytu (původní hodnota)
+        self._arrays: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        for run in self.history:
+            self._index_run(run)
+
+    def _index_run(self, run: dict) -> None:
+        """Přidá výskyty klíčových slov jednoho běhu do indexu."""
+        run_idx = len(self._dates)
+        self._dates.append(run.get("date", ""))
+        for topic in run.get("top_topics", []):
+            kw = topic.get("keyword", "")
+            kw_id = self._kw_ids.get(kw)
+            if kw_id is None:
+                kw_id = self._kw_ids[kw] = len(self._kw_names)
+                self._kw_names.append(kw)
+            self._occ_kw.append(kw_id)
+            self._occ_run.append(run_idx)
+            self._occ_score.append(topic.get("trend_score", 0))
+        self._arrays = None
+
+    def _occurrence_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Výskyty jako NumPy pole (kw_id, run_idx, score) – sestaví se jednou a drží do další změny."""
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self._occ_kw, dtype=np.intp),
+                np.array(self._occ_run, dtype=np.intp),
+                np.array(self._occ_score, dtype=np.float64),
+            )
+        return self._arrays
+
+    def _recent_run_mask(self, cutoff: str) -> np.ndarray:
+        """Maska běhů s datem >= cutoff (ISO data se porovnávají jako řetězce)."""
+        return np.array([run_date >= cutoff for run_date in self._dates], dtype=bool)
+
     def add_run(self, topics: list[dict]) -> None:
         """Přidá záznam o běhu do historie."""
         run_date = date.today().isoformat()
@@ -66,7 +158,9 @@ class HistoryTracker:
         }
 
         self.history.append(run_record)
-        self.save()
+        self._append(run_record)
+        # Průběžná aktualizace indexu bez přestavby
+        self._index_run(run_record)
 
         logger.info("Přidán záznam o běhu: %s (%d topiků)", run_date, len(topics))
 
@@ -76,75 +170,74 @@ class HistoryTracker:
         Porovnává frekvenci klíčových slov mezi staršími a novějšími běhy.
         """
         cutoff = (date.today() - timedelta(days=days)).isoformat()
-        recent_runs = [r for r in self.history if r["date"] >= cutoff]
+        recent_runs = np.flatnonzero(self._recent_run_mask(cutoff))
 
         if len(recent_runs) < 2:
             return []
 
-        # Rozdělení na starší a novější polovinu
-        mid = len(recent_runs) // 2
-        older = recent_runs[:mid]
-        newer = recent_runs[mid:]
-
-        # Agregace keyword scores
-        def _aggregate_keywords(runs: list[dict]) -> dict[str, float]:
-            scores: dict[str, list[float]] = {}
-            for run in runs:
-                for topic in run.get("top_topics", []):
-                    kw = topic.get("keyword", "")
-                    scores.setdefault(kw, []).append(topic.get("trend_score", 0))
-            return {kw: sum(s) / len(s) for kw, s in scores.items()}
-
-        older_scores = _aggregate_keywords(older)
-        newer_scores = _aggregate_keywords(newer)
-
-        # Najít rostoucí trendy
-        trending = []
-        for kw, new_score in newer_scores.items():
-            old_score = older_scores.get(kw, 0)
-            if new_score > old_score:
-                trending.append(
-                    {
-                        "keyword": kw,
-                        "current_score": new_score,
-                        "previous_score": old_score,
-                        "change": new_score - old_score,
-                        "direction": "rising",
-                    }
-                )
-
-        trending.sort(key=lambda x: x["change"], reverse=True)
-        return trending
+        # Rozdělení na starší a novější polovinu – podle indexu prvního běhu novější poloviny
+        mid_run = recent_runs[len(recent_runs) // 2]
+        kw_ids, run_ids, scores = self._occurrence_arrays()
+        recent = np.isin(run_ids, recent_runs)
+        older = recent & (run_ids < mid_run)
+        newer = recent & (run_ids >= mid_run)
+
+        # Průměrný score slova v každé polovině (bincount sčítá v pořadí výskytů)
+        n_kw = len(self._kw_names)
+        older_count = np.bincount(kw_ids[older], minlength=n_kw)
+        newer_count = np.bincount(kw_ids[newer], minlength=n_kw)
+        older_sum = np.bincount(kw_ids[older], weights=scores[older], minlength=n_kw)
+        newer_sum = np.bincount(kw_ids[newer], weights=scores[newer], minlength=n_kw)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newer_mean = newer_sum / newer_count
+            older_mean = np.where(older_count > 0, older_sum / older_count, 0.0)
+        rising = (newer_count > 0) & (newer_mean > older_mean)
+
+        # Pořadí: největší změna první, při shodě podle prvního výskytu v novější polovině
+        newer_kw = kw_ids[newer]
+        first_newer = np.full(n_kw, len(newer_kw), dtype=np.intp)
+        np.minimum.at(first_newer, newer_kw, np.arange(len(newer_kw)))
+        change = newer_mean - older_mean
+        candidates = np.flatnonzero(rising)
+        order = candidates[np.lexsort((first_newer[candidates], -change[candidates]))]
+
+        return [
+            {
+                "keyword": self._kw_names[kw_id],
+                "current_score": float(newer_mean[kw_id]),
+                # Bez výskytu ve starší polovině zůstává 0 (int) jako dřív
+                "previous_score": float(older_mean[kw_id]) if older_count[kw_id] else 0,
+                "change": float(change[kw_id]),
+                "direction": "rising",
+            }
+            for kw_id in order.tolist()
+        ]
 
     def get_new_topics(self, days: int = 7) -> list[dict]:
         """Vrací topiky, které se poprvé objevily v posledních N dnech."""
         cutoff = (date.today() - timedelta(days=days)).isoformat()
-        recent_runs = [r for r in self.history if r["date"] >= cutoff]
-        older_runs = [r for r in self.history if r["date"] < cutoff]
-
-        # Klíčová slova z minulosti
-        old_keywords: set[str] = set()
-        for run in older_runs:
-            for topic in run.get("top_topics", []):
-                old_keywords.add(topic.get("keyword", ""))
-
-        # Nová klíčová slova
-        new_topics = []
-        seen: set[str] = set()
-        for run in recent_runs:
-            for topic in run.get("top_topics", []):
-                kw = topic.get("keyword", "")
-                if kw not in old_keywords and kw not in seen:
-                    seen.add(kw)
-                    new_topics.append(
-                        {
-                            "keyword": kw,
-                            "first_seen": run["date"],
-                            "trend_score": topic.get("trend_score", 0),
-                        }
-                    )
-
-        return new_topics
+        if not self._occ_kw:
+            return []
+
+        kw_ids, run_ids, _ = self._occurrence_arrays()
+        recent_mask = self._recent_run_mask(cutoff)
+
+        # Nové = žádný výskyt v běhu starším než cutoff
+        n_kw = len(self._kw_names)
+        is_new = np.bincount(kw_ids[~recent_mask[run_ids]], minlength=n_kw) == 0
+
+        # První výskyt slova; id jsou přidělená v pořadí prvního výskytu, takže pořadí sedí
+        _, first_occ = np.unique(kw_ids, return_index=True)
+        return [
+            {
+                "keyword": self._kw_names[kw_id],
+                "first_seen": self._dates[self._occ_run[occ]],
+                "trend_score": self._occ_score[occ],
+            }
+            for kw_id, occ in enumerate(first_occ.tolist())
+            if is_new[kw_id]
+        ]
 
     def get_runs_count(self) -> int:
         """Vrátí počet záznamů v historii."""
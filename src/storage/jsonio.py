@@ -0,0 +1,106 @@
+"""Čtení a zápis JSON souborů – orjson, pokud je k dispozici, jinak standardní json.
+
+Soubory s příponou .gz se transparentně komprimují / dekomprimují (gzip).
+"""
+
+import gzip
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+# orjson je výrazně rychlejší – bez něj fallback na standardní json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Práva nově vytvořených souborů (jako open() při běžné umask 022)
+_DEFAULT_FILE_MODE = 0o644
+
+# Nejrychlejší úroveň – textový JSON se i tak zmenší několikanásobně
+_GZIP_LEVEL = 1
+
+
+def loads(data: bytes | str) -> Any:
+    """Dekóduje JSON. Chybný obsah vyhodí json.JSONDecodeError (i s orjson)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Zakóduje objekt do UTF-8 JSON (odsazený o 2 mezery, pokud indent)."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    separators = None if indent else (",", ":")
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=separators,
+        default=default,
+    ).encode("utf-8")
+
+
+def write_atomic(filepath: Path, data: bytes) -> None:
+    """Zapíše bajty atomicky – do dočasného souboru vedle cíle a pak os.replace,
+    takže přerušený běh nezanechá rozepsaný soubor.
+    """
+    filepath = Path(filepath)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp vytváří soubor s právy 0600 – zachovat práva původního souboru
+        try:
+            mode = stat.S_IMODE(filepath.stat().st_mode)
+        except FileNotFoundError:
+            mode = _DEFAULT_FILE_MODE
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _is_gzip(filepath: Path) -> bool:
+    return Path(filepath).suffix == ".gz"
+
+
+def load_json(filepath: Path) -> Any:
+    """Načte JSON soubor (.gz dekomprimuje). Chybný obsah vyhodí json.JSONDecodeError (i s orjson)."""
+    data = Path(filepath).read_bytes()
+    if _is_gzip(filepath):
+        data = gzip.decompress(data)
+    return loads(data)
+
+
+def dump_json(
+    obj: Any,
+    filepath: Path,
+    indent: bool = True,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """Atomicky zapíše objekt jako UTF-8 JSON (odsazený o 2 mezery, pokud indent).
+
+    Cesta s příponou .gz se zapíše komprimovaně.
+    """
+    data = dumps(obj, indent=indent, default=default)
+    if _is_gzip(filepath):
+        data = gzip.compress(data, compresslevel=_GZIP_LEVEL, mtime=0)
+    write_atomic(filepath, data)
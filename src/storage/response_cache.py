@@ -0,0 +1,75 @@
+"""Perzistentní cache odpovědí AI – opakované vstupy se neplatí znovu."""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from src.storage.jsonio import dump_json, load_json
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(payload: dict) -> str:
+    """SHA256 klíč z kanonického JSON (sort_keys) vstupů."""
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Ukládá výsledky podle klíče s expirací (TTL).
+
+    Záznamy starší než TTL se při načtení zahodí.
+    Soubor: data/ai_cache.json
+    """
+
+    def __init__(self, data_dir: Path, ttl_days: float = 7):
+        self.cache_file = Path(data_dir) / "ai_cache.json"
+        self.ttl_seconds = ttl_days * 86400
+        self._cache: dict[str, dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        """Načte cache z JSON souboru a zahodí expirované záznamy."""
+        if not self.cache_file.exists():
+            return {}
+
+        try:
+            cache = load_json(self.cache_file)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Chyba při načítání AI cache: %s", e)
+            return {}
+
+        now = time.time()
+        return {
+            key: record
+            for key, record in cache.items()
+            if now - record.get("ts", 0) < self.ttl_seconds
+        }
+
+    def save(self) -> None:
+        """Uloží cache do JSON souboru (jen pokud se změnila)."""
+        if not self._dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(self._cache, self.cache_file, indent=False)
+        self._dirty = False
+
+    def get(self, key: str, max_age: float | None = None) -> Any:
+        """Vrátí uloženou hodnotu (nebo None).
+
+        Args:
+            max_age: Kratší platnost v sekundách pro tento druh záznamu (jinak TTL cache)
+        """
+        record = self._cache.get(key)
+        ttl = self.ttl_seconds if max_age is None else min(max_age, self.ttl_seconds)
+        if record is None or time.time() - record.get("ts", 0) >= ttl:
+            return None
+        return record["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        """Uloží hodnotu pod klíčem."""
+        self._cache[key] = {"ts": time.time(), "value": value}
+        self._dirty = True
@@ -1,12 +1,18 @@
-"""JSON/CSV persistence pro surová data, zpracované topiky a reporty."""
+"""JSON/CSV persistence pro surová data, zpracované topiky a reporty.
+
+Surová a zpracovaná data se ukládají jako .json.gz (zapisují se jednou, čtou zřídka),
+report zůstává čitelný .json.
+"""
 
 import csv
-import json
 import logging
 from datetime import date, datetime
+from itertools import chain
 from pathlib import Path
 from typing import Any, Optional
 
+from src.storage.jsonio import dump_json, load_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,14 +24,16 @@ class DataStore:
         self.raw_dir = self.data_dir / "raw"
         self.processed_dir = self.data_dir / "processed"
         self.reports_dir = self.data_dir / "reports"
+        # Datum běhu – všechny soubory běhu nesou stejné datum (i když běh přejde přes půlnoc)
+        self.run_date: str = date.today().isoformat()
 
         # Zajistit, že adresáře existují
         for d in [self.raw_dir, self.processed_dir, self.reports_dir]:
             d.mkdir(parents=True, exist_ok=True)
 
     def _today(self) -> str:
-        """Vrátí dnešní datum jako string YYYY-MM-DD."""
-        return date.today().isoformat()
+        """Vrátí datum běhu jako string YYYY-MM-DD."""
+        return self.run_date
 
     def _json_serializer(self, obj: Any) -> Any:
         """Serializátor pro JSON (datetime apod.)."""
@@ -33,24 +41,26 @@ class DataStore:
             return obj.isoformat()
         raise TypeError(f"Typ {type(obj)} není serializovatelný")
 
+    def _dump_json(self, obj: Any, filepath: Path) -> None:
+        """Zapíše objekt jako odsazený UTF-8 JSON (orjson, pokud je k dispozici)."""
+        dump_json(obj, filepath, default=self._json_serializer)
+
     def save_raw(self, items: list[dict], source: str) -> Path:
-        """Uloží surová data jako JSON. Soubor: {date}_{source}.json"""
-        filename = f"{self._today()}_{source}.json"
+        """Uloží surová data jako komprimovaný JSON. Soubor: {date}_{source}.json.gz"""
+        filename = f"{self._today()}_{source}.json.gz"
         filepath = self.raw_dir / filename
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False, indent=2, default=self._json_serializer)
+        self._dump_json(items, filepath)
 
         logger.info("Surová data uložena: %s (%d položek)", filepath, len(items))
         return filepath
 
     def save_processed(self, topics: list[dict]) -> Path:
-        """Uloží zpracované topiky jako JSON. Soubor: {date}_topics.json"""
-        filename = f"{self._today()}_topics.json"
+        """Uloží zpracované topiky jako komprimovaný JSON. Soubor: {date}_topics.json.gz"""
+        filename = f"{self._today()}_topics.json.gz"
         filepath = self.processed_dir / filename
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(topics, f, ensure_ascii=False, indent=2, default=self._json_serializer)
+        self._dump_json(topics, filepath)
 
         logger.info("Zpracované topiky uloženy: %s (%d topiků)", filepath, len(topics))
         return filepath
@@ -60,8 +70,7 @@ class DataStore:
         filename = f"{self._today()}_report.json"
         filepath = self.reports_dir / filename
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2, default=self._json_serializer)
+        self._dump_json(report, filepath)
 
         logger.info("JSON report uložen: %s", filepath)
         return filepath
@@ -82,48 +91,55 @@ class DataStore:
             "latest_date",
         ]
 
-        with open(filepath, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
-            writer.writeheader()
-
-            for topic in topics:
-                # Zploštění kategorií
-                categories = topic.get("categories", [])
-                category_str = ", ".join(
-                    c.get("display_name", c.get("category", ""))
-                    for c in categories
-                    if isinstance(c, dict)
-                )
-
-                sources = topic.get("sources", [])
-                sources_str = ", ".join(sources) if isinstance(sources, list) else str(sources)
-
-                row = {
-                    "keyword": topic.get("keyword", ""),
-                    "category": category_str,
-                    "trend_score": topic.get("trend_score", 0),
-                    "frequency_score": topic.get("frequency_score", 0),
-                    "recency_score": topic.get("recency_score", 0),
-                    "mention_count": topic.get("mention_count", 0),
-                    "sources": sources_str,
-                    "latest_date": topic.get("latest_date", ""),
-                }
-                writer.writerow(row)
+        def _row(topic: dict) -> tuple:
+            # Zploštění kategorií a zdrojů
+            categories = topic.get("categories", [])
+            category_str = ", ".join(
+                c.get("display_name", c.get("category", ""))
+                for c in categories
+                if isinstance(c, dict)
+            )
+            sources = topic.get("sources", [])
+            sources_str = ", ".join(sources) if isinstance(sources, list) else str(sources)
+
+            return (
+                topic.get("keyword", ""),
+                category_str,
+                topic.get("trend_score", 0),
+                topic.get("frequency_score", 0),
+                topic.get("recency_score", 0),
+                topic.get("mention_count", 0),
+                sources_str,
+                topic.get("latest_date", ""),
+            )
+
+        with open(filepath, "w", encoding="utf-8", newline="", buffering=65536) as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(_row(topic) for topic in topics)
 
         logger.info("CSV report uložen: %s (%d řádků)", filepath, len(topics))
         return filepath
 
     def load_latest_processed(self) -> Optional[list[dict]]:
-        """Načte poslední zpracovaná data (podle datumu v názvu souboru)."""
-        files = sorted(self.processed_dir.glob("*_topics.json"), reverse=True)
-
-        if not files:
+        """Načte poslední zpracovaná data (podle datumu v názvu souboru).
+
+        Čte .json.gz i starší nekomprimované .json.
+        """
+        filepath = max(
+            chain(
+                self.processed_dir.glob("*_topics.json.gz"),
+                self.processed_dir.glob("*_topics.json"),
+            ),
+            default=None,
+            key=lambda p: p.name,
+        )
+
+        if filepath is None:
             logger.warning("Žádná zpracovaná data nenalezena v %s", self.processed_dir)
             return None
 
-        filepath = files[0]
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(filepath)
 
         logger.info("Načtena zpracovaná data: %s (%d topiků)", filepath, len(data))
         return data
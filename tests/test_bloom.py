@@ -0,0 +1,101 @@
+"""Testy Bloom filtru odeslaných URL a jeho obnovy v BigQueryDedup."""
+
+import time
+from types import SimpleNamespace
+
+from src.storage import bigquery_dedup
+from src.storage.bigquery_dedup import BigQueryDedup, _url_hashes_batch
+from src.storage.bloom import BloomFilter
+
+_DAY = 86400
+
+
+def _seeded_dedup(data_dir, built_days_ago: float) -> BigQueryDedup:
+    """BigQueryDedup s naplněným filtrem postaveným před built_days_ago dny."""
+    dedup = BigQueryDedup({"bigquery": {"bloom_rebuild_days": 7}}, data_dir)
+    dedup._bloom.update(["hash-a"])
+    dedup._bloom.created_at = time.time() - built_days_ago * _DAY
+    dedup._bloom.save(dedup.bloom_file)
+    dedup._bloom_ready = True
+    return dedup
+
+
+def test_save_load_roundtrip(tmp_path):
+    bloom = BloomFilter()
+    bloom.update(["a", "b"])
+    bloom.save(tmp_path / "f.bloom")
+
+    loaded = BloomFilter.load(tmp_path / "f.bloom")
+
+    assert loaded is not None
+    assert "a" in loaded and "b" in loaded
+    assert "c" not in loaded
+    assert loaded.created_at == bloom.created_at
+
+
+def test_load_rejects_headerless_file(tmp_path):
+    path = tmp_path / "f.bloom"
+    path.write_bytes(bytes(len(BloomFilter()._bits)))
+
+    assert BloomFilter.load(path) is None
+
+
+def test_filter_expires_despite_updates(tmp_path):
+    dedup = _seeded_dedup(tmp_path, built_days_ago=8)
+
+    # Denní mark_sent soubor přepíše (mtime = teď) – stáří se přesto počítá od vytvoření
+    dedup._record_sent(["hash-b"])
+
+    reloaded = BigQueryDedup({"bigquery": {"bloom_rebuild_days": 7}}, tmp_path)
+    assert not reloaded._bloom_ready
+    assert "hash-a" not in reloaded._bloom
+
+
+def test_fresh_filter_survives_updates(tmp_path):
+    dedup = _seeded_dedup(tmp_path, built_days_ago=1)
+    dedup._record_sent(["hash-b"])
+
+    reloaded = BigQueryDedup({"bigquery": {"bloom_rebuild_days": 7}}, tmp_path)
+    assert reloaded._bloom_ready
+    assert "hash-a" in reloaded._bloom and "hash-b" in reloaded._bloom
+
+
+class _FakeClient:
+    """Minimální BigQuery klient nad tabulkou odeslaných hashů, zaznamenává dotazy."""
+
+    def __init__(self, sent: list[str]):
+        self.sent = sent
+        self.queries: list[str] = []
+
+    def query(self, sql, job_config=None):
+        self.queries.append(sql)
+        # Anti-join vrací neodeslané kandidáty – v testu jsou všichni kandidáti odeslaní
+        rows = [] if "UNNEST" in sql else [SimpleNamespace(url_hash=h) for h in self.sent]
+        return SimpleNamespace(result=lambda: rows)
+
+
+def _fake_bigquery():
+    return SimpleNamespace(
+        QueryJobConfig=lambda query_parameters: None,
+        ScalarQueryParameter=lambda *args: None,
+        ArrayQueryParameter=lambda *args: None,
+    )
+
+
+def test_filter_new_syncs_sends_from_other_instances(tmp_path, monkeypatch):
+    monkeypatch.setattr(bigquery_dedup, "bigquery", _fake_bigquery(), raising=False)
+    _seeded_dedup(tmp_path, built_days_ago=1)
+    (url_hash,) = _url_hashes_batch(["https://example.com/a"])
+
+    # Jiná instance mezitím článek odeslala – lokální filtr ho nezná
+    dedup = BigQueryDedup({"bigquery": {"bloom_rebuild_days": 7}}, tmp_path)
+    dedup.client = _FakeClient([url_hash])
+    dedup.project = "p"
+    item = SimpleNamespace(url="https://example.com/a")
+
+    assert dedup.filter_new([item]) == []
+    assert url_hash in dedup._bloom
+
+    # Synchronizace proběhne jen jednou za běh
+    dedup.filter_new([item])
+    assert sum("@since" in q for q in dedup.client.queries) == 1
@@ -0,0 +1,147 @@
+"""Porovnání TopicCategorizer (Aho-Corasick) s původní implementací podřetězcových průchodů."""
+
+import pytest
+
+from src.fetchers.base import FetchedItem
+from src.processing import categorizer
+from src.processing.categorizer import TopicCategorizer
+
+_KEYWORDS = {
+    "ai": ["ai", "machine learning", "llm", "gpt", "neural network", "gpt", ""],
+    "marketing": ["seo", "email marketing", "marketing", "ads", "", "brand"],
+    "analytics": ["analytics", "google analytics", "dashboard", "data", "ga4"],
+    "empty": [""],
+}
+_CATEGORIES = {"ai": {"display_name": "AI"}, "marketing": {"display_name": "Marketing"}}
+
+_CORPUS = [
+    FetchedItem(title="GPT-5 release", description="New LLM beats every neural network benchmark"),
+    FetchedItem(title="SEO tips", description="Email marketing and brand ads for 2026"),
+    FetchedItem(title="GA4 dashboard", description="Google Analytics data migration"),
+    FetchedItem(title="Nothing here", description="Completely unrelated text"),
+    FetchedItem(title="Intro", description="Applied machine"),
+    FetchedItem(title="Empty description"),
+    FetchedItem(title="learning curve", description="Tips on data"),
+]
+
+_BATCH = [
+    ("gpt", [0, 1]),
+    ("llm", [0]),
+    ("seo", [1, 2]),
+    ("email", [1]),
+    ("analytics", [2]),
+    ("google analytics", [2, 6]),
+    ("ga", [2]),
+    ("marketing", []),
+    ("unrelated", [3]),
+    ("machine", [4, 5, 6]),
+    ("network", [4, 6]),
+    ("a", [0, 1, 2, 3, 4, 5, 6]),
+    ("", [1]),
+    ("GPT ", [0, 99]),
+]
+
+
+def _reference_categorize(
+    keywords: dict, categories_config: dict, keyword: str, context: str = ""
+) -> list[dict]:
+    """Původní TopicCategorizer.categorize() – lineární průchody slovníky."""
+    keyword_lower = keyword.lower().strip()
+    context_lower = context.lower()
+    results = []
+
+    for category, word_list in keywords.items():
+        confidence = 0.0
+        if keyword_lower in word_list:
+            confidence += 0.8
+        for word in word_list:
+            if word in keyword_lower and word != keyword_lower:
+                confidence += 0.4
+                break
+            if keyword_lower in word and word != keyword_lower:
+                confidence += 0.3
+                break
+        if context_lower:
+            context_matches = sum(1 for w in word_list if w in context_lower)
+            confidence += min(context_matches * 0.1, 0.5)
+        if confidence >= 0.3:
+            display_name = categories_config.get(category, {}).get("display_name", category)
+            results.append(
+                {"category": category, "display_name": display_name, "confidence": min(confidence, 1.0)}
+            )
+
+    results.sort(key=lambda x: x["confidence"], reverse=True)
+    if not results:
+        results.append({"category": "other", "display_name": "Other", "confidence": 0.0})
+    return results
+
+
+def _without_empty(keywords: dict) -> dict:
+    # Prázdná slova nová implementace záměrně přeskakuje (dřív sedla na každý text)
+    return {category: [w for w in words if w] for category, words in keywords.items()}
+
+
+@pytest.fixture(params=[True, False], ids=["ahocorasick", "fallback"])
+def make_categorizer(request, monkeypatch):
+    if request.param and not categorizer.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick není nainstalovaný")
+    monkeypatch.setattr(categorizer, "AHOCORASICK_AVAILABLE", request.param)
+    return lambda: TopicCategorizer(_KEYWORDS, _CATEGORIES)
+
+
+def test_categorize_matches_reference(make_categorizer):
+    cat = make_categorizer()
+    reference_keywords = _without_empty(_KEYWORDS)
+
+    for item in _CORPUS:
+        context = f"{item.title} {item.description}"
+        for keyword, _ in _BATCH:
+            assert cat.categorize(keyword, context) == _reference_categorize(
+                reference_keywords, _CATEGORIES, keyword, context
+            ), (keyword, context)
+            assert cat.categorize(keyword) == _reference_categorize(reference_keywords, _CATEGORIES, keyword)
+
+
+def test_categorize_batch_matches_reference(make_categorizer):
+    cat = make_categorizer()
+    reference_keywords = _without_empty(_KEYWORDS)
+    keywords_data = [{"keyword": kw, "source_items": items} for kw, items in _BATCH]
+
+    result = cat.categorize_batch(keywords_data, _CORPUS)
+
+    for kw_data in result:
+        # Kontext po položkách – oddělovač, přes který žádné slovo slovníku nesedne
+        context = "\n".join(
+            f"{_CORPUS[i].title} {_CORPUS[i].description}" for i in kw_data["source_items"] if i < len(_CORPUS)
+        )
+        assert kw_data["categories"] == _reference_categorize(
+            reference_keywords, _CATEGORIES, kw_data["keyword"], context
+        ), kw_data["keyword"]
+
+
+def test_empty_dictionary_words_are_ignored(make_categorizer):
+    cat = make_categorizer()
+
+    # Dřív "" sedlo jako podřetězec na každé klíčové slovo (+0.4) i kontext
+    assert cat.categorize("unrelated", "unrelated") == [
+        {"category": "other", "display_name": "Other", "confidence": 0.0}
+    ]
+    assert "" not in cat._word_index
+
+
+def test_context_match_does_not_span_item_boundary(make_categorizer):
+    cat = make_categorizer()
+    keywords_data = [{"keyword": "network", "source_items": [4, 6]}]
+    texts = [f"{_CORPUS[i].title} {_CORPUS[i].description}" for i in (4, 6)]
+
+    # Původní implementace spojila kontexty mezerou: "... applied machine" + " " +
+    # "learning curve ..." dalo "machine learning" přes hranici dvou položek
+    joined = " ".join(texts)
+    assert "machine learning" in cat._find_words(joined.lower())
+    old = _reference_categorize(_without_empty(_KEYWORDS), _CATEGORIES, "network", joined)
+    assert [(c["category"], round(c["confidence"], 2)) for c in old] == [("ai", 0.4)]
+
+    # Nově se slova hledají v každé položce zvlášť – zůstane jen částečná shoda s "neural network"
+    cat.categorize_batch(keywords_data, _CORPUS)
+    assert "machine learning" not in set().union(*(cat._find_words(t.lower()) for t in texts))
+    assert [(c["category"], round(c["confidence"], 2)) for c in keywords_data[0]["categories"]] == [("ai", 0.3)]
@@ -0,0 +1,79 @@
+"""Testy pořadí trendů a nových topiků v HistoryTracker."""
+
+from datetime import date, timedelta
+
+from src.storage.history import HistoryTracker
+from src.storage.jsonio import dumps
+
+
+def _day(days_ago: int) -> str:
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+def _tracker(tmp_path, runs: list[tuple[int, list[tuple[str, float]]]]) -> HistoryTracker:
+    """HistoryTracker nad ručně sestavenou historií [(před kolika dny, [(keyword, score)])]."""
+    records = [
+        {
+            "date": _day(days_ago),
+            "top_topics": [{"keyword": kw, "trend_score": score} for kw, score in topics],
+        }
+        for days_ago, topics in runs
+    ]
+    (tmp_path / "history.ndjson").write_bytes(b"".join(dumps(r) + b"\n" for r in records))
+    return HistoryTracker(tmp_path)
+
+
+# Skóre jsou binárně přesná (násobky 1/4) – shody ve změně jsou skutečné shody
+_RUNS = [
+    (30, [("old", 1.0), ("alpha", 0.25)]),                      # mimo okno 7 dní
+    (3, [("alpha", 0.25), ("beta", 0.5), ("gamma", 0.25)]),     # starší polovina
+    (2, [("alpha", 0.75), ("delta", 0.5)]),                     # starší polovina
+    (1, [("beta", 0.75), ("gamma", 0.5), ("epsilon", 0.25)]),   # novější polovina
+    (0, [("alpha", 1.0), ("zeta", 0.25), ("delta", 0.5)]),      # novější polovina
+]
+
+
+def test_trending_order_and_ties(tmp_path):
+    trending = _tracker(tmp_path, _RUNS).get_trending(days=7)
+
+    # Největší změna první; shody (0.25) podle prvního výskytu v novější polovině.
+    # delta se nezměnila (0.5 -> 0.5), proto chybí.
+    assert [t["keyword"] for t in trending] == ["alpha", "beta", "gamma", "epsilon", "zeta"]
+    assert [t["change"] for t in trending] == [0.5, 0.25, 0.25, 0.25, 0.25]
+
+    by_keyword = {t["keyword"]: t for t in trending}
+    assert by_keyword["alpha"]["current_score"] == 1.0
+    assert by_keyword["alpha"]["previous_score"] == 0.5
+    # Bez výskytu ve starší polovině je previous_score 0 (int)
+    assert by_keyword["epsilon"]["previous_score"] == 0
+    assert isinstance(by_keyword["epsilon"]["previous_score"], int)
+
+
+def test_trending_needs_two_recent_runs(tmp_path):
+    tracker = _tracker(tmp_path, [(30, [("old", 1.0)]), (0, [("alpha", 0.5)])])
+
+    assert tracker.get_trending(days=7) == []
+
+
+def test_new_topics_order(tmp_path):
+    new_topics = _tracker(tmp_path, _RUNS).get_new_topics(days=7)
+
+    # Pořadí prvního výskytu v okně; alpha už byla v běhu mimo okno
+    assert new_topics == [
+        {"keyword": "beta", "first_seen": _day(3), "trend_score": 0.5},
+        {"keyword": "gamma", "first_seen": _day(3), "trend_score": 0.25},
+        {"keyword": "delta", "first_seen": _day(2), "trend_score": 0.5},
+        {"keyword": "epsilon", "first_seen": _day(1), "trend_score": 0.25},
+        {"keyword": "zeta", "first_seen": _day(0), "trend_score": 0.25},
+    ]
+
+
+def test_add_run_updates_index(tmp_path):
+    tracker = _tracker(tmp_path, _RUNS[:4])
+    tracker.add_run([{"keyword": "alpha", "trend_score": 1.0}, {"keyword": "zeta", "trend_score": 0.25}])
+
+    reloaded = HistoryTracker(tmp_path)
+    assert [t["keyword"] for t in tracker.get_trending(days=7)] == [
+        t["keyword"] for t in reloaded.get_trending(days=7)
+    ]
+    assert [t["keyword"] for t in tracker.get_new_topics(days=7)][-1] == "zeta"
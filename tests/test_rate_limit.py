@@ -0,0 +1,131 @@
+"""Testy token bucketu per host v BaseFetcher (_reserve_token / _HOST_BUCKETS)."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.fetchers import base
+from src.fetchers.base import BaseFetcher
+
+
+class _Fetcher(BaseFetcher):
+    def fetch(self):
+        return []
+
+    @property
+    def source_name(self) -> str:
+        return "test"
+
+
+class _Clock:
+    """Ručně posouvané hodiny místo time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(base.time, "monotonic", clock)
+    monkeypatch.setattr(base, "_HOST_BUCKETS", {})
+    return clock
+
+
+def test_burst_then_rate(clock):
+    fetcher = _Fetcher({"rate_per_sec": 4.0, "burst": 2.0})
+    url = "https://example.com/feed"
+
+    # Burst 2 projde hned, další požadavky čekají 1/rate, 2/rate, ...
+    waits = [fetcher._reserve_token(url) for _ in range(5)]
+
+    assert waits == pytest.approx([0.0, 0.0, 0.25, 0.5, 0.75])
+
+
+def test_refill_rate(clock):
+    fetcher = _Fetcher({"rate_per_sec": 2.0, "burst": 1.0})
+    url = "https://example.com/feed"
+
+    assert fetcher._reserve_token(url) == 0.0
+    clock.now += 0.25
+    # Za 0.25 s se doplnilo 0.5 tokenu (2/s) – zbylá polovina tokenu = 0.25 s čekání
+    assert fetcher._reserve_token(url) == pytest.approx(0.25)
+    clock.now += 0.25 + 0.5
+    # Dluh 0.5 tokenu se splatí za 0.25 s, za dalších 0.5 s se doplní celý token
+    assert fetcher._reserve_token(url) == 0.0
+
+
+def test_refill_capped_at_burst(clock):
+    fetcher = _Fetcher({"rate_per_sec": 1.0, "burst": 3.0})
+    url = "https://example.com/feed"
+    for _ in range(3):
+        fetcher._reserve_token(url)
+
+    # Dlouhá nečinnost nedoplní víc než burst tokenů
+    clock.now += 3600
+    waits = [fetcher._reserve_token(url) for _ in range(4)]
+
+    assert waits == pytest.approx([0.0, 0.0, 0.0, 1.0])
+
+
+def test_buckets_are_per_host_and_shared_by_fetchers(clock):
+    first = _Fetcher({"rate_per_sec": 1.0, "burst": 1.0})
+    second = _Fetcher({"rate_per_sec": 1.0, "burst": 1.0})
+
+    assert first._reserve_token("https://a.example.com/1") == 0.0
+    assert first._reserve_token("https://b.example.com/1") == 0.0
+    # Jiný fetcher na stejném hostu sdílí bucket
+    assert second._reserve_token("https://a.example.com/2") == pytest.approx(1.0)
+    assert set(base._HOST_BUCKETS) == {"a.example.com", "b.example.com"}
+
+
+def test_rate_limit_disabled(clock):
+    fetcher = _Fetcher({"rate_limit": 0})
+
+    assert [fetcher._reserve_token("https://example.com") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert base._HOST_BUCKETS == {}
+
+
+def test_concurrent_reservations_same_host(clock):
+    fetcher = _Fetcher({"rate_per_sec": 10.0, "burst": 2.0})
+    n_threads = 32
+    barrier = threading.Barrier(n_threads)
+    waits: list[float] = []
+    waits_lock = threading.Lock()
+
+    def reserve():
+        barrier.wait()
+        wait = fetcher._reserve_token("https://example.com/feed")
+        with waits_lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=reserve) for _ in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Každé vlákno dostalo vlastní slot – žádné dva požadavky nesdílí stejné čekání
+    expected = [max(0.0, (k - 1) / 10.0) for k in range(n_threads)]
+    assert sorted(waits) == pytest.approx(expected)
+
+
+def test_rate_limit_async_sleeps_reserved_wait(clock, monkeypatch):
+    fetcher = _Fetcher({"rate_per_sec": 2.0, "burst": 1.0})
+    slept: list[float] = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(base.asyncio, "sleep", fake_sleep)
+
+    async def run():
+        await asyncio.gather(*(fetcher._rate_limit_async("https://example.com") for _ in range(3)))
+
+    asyncio.run(run())
+
+    assert sorted(slept) == pytest.approx([0.5, 1.0])
@@ -0,0 +1,139 @@
+"""Testy parsování RSS/Atom feedů a kanonizace URL."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.fetchers import rss
+from src.fetchers.rss import canonical_url, new_entries, parse_feed
+
+_RSS_CONTENT_ONLY = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>RSS feed</title>
+    <item>
+      <title>First</title>
+      <link>https://example.com/first</link>
+      <content:encoded><![CDATA[<p>Body of first</p>]]></content:encoded>
+      <pubDate>Tue, 13 Oct 2026 10:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Second</title>
+      <link>https://example.com/second</link>
+      <description>Plain description</description>
+    </item>
+  </channel>
+</rss>"""
+
+_ATOM_CONTENT_ONLY = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom feed</title>
+  <entry>
+    <title>Atom entry</title>
+    <link rel="alternate" href="https://example.com/atom"/>
+    <content type="html">Atom body</content>
+    <updated>2026-10-13T10:00:00Z</updated>
+  </entry>
+</feed>"""
+
+# Neescapovaný "&" – lxml selže, feedparser (tolerantní) feed přečte
+_MALFORMED = b"""<rss version="2.0"><channel><title>Broken</title>
+<item><title>Fish & Chips</title><link>https://example.com/fish</link></item>
+</channel></rss>"""
+
+
+def _entry(link: str, title: str = "") -> dict:
+    return {"title": title, "link": link, "summary": "", "published": None}
+
+
+@pytest.mark.skipif(not rss.LXML_AVAILABLE, reason="lxml není nainstalované")
+def test_rss_content_encoded_as_summary():
+    feed_title, entries = parse_feed(_RSS_CONTENT_ONLY)
+
+    assert feed_title == "RSS feed"
+    assert [e["link"] for e in entries] == ["https://example.com/first", "https://example.com/second"]
+    assert entries[0]["summary"] == "<p>Body of first</p>"
+    assert entries[0]["published"] == datetime(2026, 10, 13, 10, 0, tzinfo=timezone.utc)
+    assert entries[1]["summary"] == "Plain description"
+    assert entries[1]["published"] is None
+
+
+@pytest.mark.skipif(not rss.LXML_AVAILABLE, reason="lxml není nainstalované")
+def test_atom_content_as_summary():
+    feed_title, entries = parse_feed(_ATOM_CONTENT_ONLY)
+
+    assert feed_title == "Atom feed"
+    assert entries == [
+        {
+            "title": "Atom entry",
+            "link": "https://example.com/atom",
+            "summary": "Atom body",
+            "published": datetime(2026, 10, 13, 10, 0, tzinfo=timezone.utc),
+        }
+    ]
+
+
+def test_lxml_and_feedparser_agree_on_content_only_feeds():
+    for data in (_RSS_CONTENT_ONLY, _ATOM_CONTENT_ONLY):
+        lxml_entries = parse_feed(data)[1]
+        fp_entries = rss._parse_feedparser(data)[1]
+        assert [(e["title"], e["link"], e["summary"]) for e in lxml_entries] == [
+            (e["title"], e["link"], e["summary"]) for e in fp_entries
+        ]
+
+
+@pytest.mark.skipif(not rss.LXML_AVAILABLE, reason="lxml není nainstalované")
+def test_malformed_xml_falls_back_to_feedparser(monkeypatch):
+    calls = []
+    original = rss._parse_feedparser
+    monkeypatch.setattr(rss, "_parse_feedparser", lambda data: calls.append(data) or original(data))
+
+    feed_title, entries = parse_feed(_MALFORMED)
+
+    assert calls == [_MALFORMED]
+    assert feed_title == "Broken"
+    assert [e["link"] for e in entries] == ["https://example.com/fish"]
+
+
+def test_canonical_url_drops_tracking_params_keeps_order():
+    url = "https://example.com/a?b=2&utm_source=x&a=1&ref=tw&utm_medium=y&c=3"
+
+    assert canonical_url(url) == "https://example.com/a?b=2&a=1&c=3"
+
+
+def test_canonical_url_only_tracking_params():
+    assert canonical_url("https://example.com/a?utm_source=x&fbclid=1") == "https://example.com/a"
+
+
+def test_canonical_url_keeps_identifying_query():
+    assert canonical_url("https://example.com/article.php?id=1") != canonical_url(
+        "https://example.com/article.php?id=2"
+    )
+
+
+def test_canonical_url_trailing_slash_and_host_case():
+    assert canonical_url("HTTPS://Example.COM/Path/Post/#comments") == "https://example.com/Path/Post"
+    assert canonical_url("https://example.com/Path/Post") == "https://example.com/Path/Post"
+    assert canonical_url("https://EXAMPLE.com/") == "https://example.com"
+
+
+def test_new_entries_dedups_canonical_urls_across_feeds():
+    seen: set[str] = set()
+    first = new_entries(
+        [_entry("https://example.com/a/", "A1"), _entry("https://EXAMPLE.com/a?utm_source=x", "A2")],
+        seen,
+    )
+    second = new_entries([_entry("https://example.com/a", "A3"), _entry("https://example.com/b")], seen)
+
+    assert [e["title"] for e in first] == ["A1"]
+    assert [e["link"] for e in second] == ["https://example.com/b"]
+
+
+def test_new_entries_empty_links():
+    # Prázdný odkaz je jako dřív jedna "URL" – projde jen první položka bez odkazu
+    seen: set[str] = set()
+    first = new_entries([_entry("", "no-link-1"), _entry("", "no-link-2")], seen)
+    second = new_entries([_entry("", "no-link-3")], seen)
+
+    assert [e["title"] for e in first] == ["no-link-1"]
+    assert second == []
@@ -0,0 +1,147 @@
+"""Testy parsování odpovědí Claude v TopicSummarizer (sekce a dávkové bloky)."""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.processing.summarizer import TopicSummarizer
+
+_FULL = """SOUHRN (2-3 věty):
+Firmy přecházejí na GA4.
+Migrace končí v červenci.
+
+PROČ JE TO DŮLEŽITÉ (1-2 věty):
+Staré reporty přestanou fungovat.
+
+NÁVRH ČLÁNKU - TITULEK:
+Jak přežít migraci na GA4
+
+NÁVRH ČLÁNKU - ÚHEL:
+Praktický checklist pro analytiky."""
+
+_EXPECTED = {
+    "summary": "Firmy přecházejí na GA4.\nMigrace končí v červenci.",
+    "why_it_matters": "Staré reporty přestanou fungovat.",
+    "article_idea": "Jak přežít migraci na GA4",
+    "article_angle": "Praktický checklist pro analytiky.",
+}
+
+
+def _summarizer() -> TopicSummarizer:
+    return TopicSummarizer({"ai": {"enabled": True}})
+
+
+def test_parse_full_response():
+    assert _summarizer()._parse_response(_FULL) == _EXPECTED
+
+
+def test_parse_missing_sections():
+    text = "SOUHRN: Jen souhrn na řádku hlavičky.\n\nNÁVRH ČLÁNKU - ÚHEL:\nÚhel."
+
+    assert _summarizer()._parse_response(text) == {
+        "summary": "Jen souhrn na řádku hlavičky.",
+        "why_it_matters": "",
+        "article_idea": "",
+        "article_angle": "Úhel.",
+    }
+
+
+def test_parse_reordered_sections():
+    blocks = _FULL.split("\n\n")
+    reordered = "\n\n".join([blocks[3], blocks[1], blocks[0], blocks[2]])
+
+    assert _summarizer()._parse_response(reordered) == _EXPECTED
+
+
+def test_parse_ignores_prose_before_first_header():
+    text = "Jasně, tady je analýza tématu:\n\n" + _FULL
+
+    assert _summarizer()._parse_response(text) == _EXPECTED
+
+
+def test_parse_headers_case_and_indent():
+    text = "  Souhrn:\nMalými písmeny.\n\tproč je to důležité:\nOdsazená hlavička."
+
+    result = _summarizer()._parse_response(text)
+
+    assert result["summary"] == "Malými písmeny."
+    assert result["why_it_matters"] == "Odsazená hlavička."
+
+
+def test_parse_without_headers():
+    assert _summarizer()._parse_response("Omlouvám se, nemohu odpovědět.") == {
+        "summary": "",
+        "why_it_matters": "",
+        "article_idea": "",
+        "article_angle": "",
+    }
+
+
+def test_split_batch():
+    text = f"Úvodní text modelu.\n### TÉMA 1 ###\n{_FULL}\n\n  ###  TÉMA 3 ###  \nSOUHRN: Třetí."
+
+    blocks = TopicSummarizer._split_batch(text)
+
+    assert sorted(blocks) == [1, 3]
+    assert _summarizer()._parse_response(blocks[1]) == _EXPECTED
+    assert _summarizer()._parse_response(blocks[3])["summary"] == "Třetí."
+
+
+def test_split_batch_without_markers():
+    assert TopicSummarizer._split_batch(_FULL) == {}
+
+
+class _FakeClient:
+    """AsyncAnthropic náhrada vracející pevnou odpověď, zaznamenává požadavky."""
+
+    def __init__(self, text: str):
+        self.requests: list[dict] = []
+        self.messages = SimpleNamespace(create=self._create)
+        self._text = text
+
+    async def _create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(content=[SimpleNamespace(text=self._text)])
+
+    async def close(self):
+        pass
+
+
+def _batch_summarizer(monkeypatch, reply: str) -> tuple[TopicSummarizer, _FakeClient]:
+    summarizer = _summarizer()
+    summarizer.client_available = True
+    client = _FakeClient(reply)
+    monkeypatch.setattr(summarizer, "_new_client", lambda: client)
+    return summarizer, client
+
+
+_GROUPS = [
+    ("ga4", [{"title": "GA4 migrace", "source": "rss"}], "analytics"),
+    ("llm", [{"title": "Nový LLM", "source": "hn"}], "ai"),
+    ("seo", [{"title": "SEO update", "source": "reddit"}], "marketing"),
+]
+
+
+def test_batch_reply_with_missing_block(monkeypatch):
+    # Blok pro téma 2 chybí – dostane fallback, ostatní se rozparsují
+    reply = f"### TÉMA 1 ###\n{_FULL}\n### TÉMA 3 ###\nSOUHRN: SEO se mění."
+    summarizer, client = _batch_summarizer(monkeypatch, reply)
+
+    results = asyncio.run(summarizer.summarize_topic_batch_async(_GROUPS))
+
+    assert len(client.requests) == 1
+    # Instrukce jdou jako prostý system prompt (bez cache_control)
+    assert isinstance(client.requests[0]["system"], str)
+    assert results[0] == _EXPECTED
+    assert results[1] == summarizer._fallback_summary("llm", _GROUPS[1][1])
+    assert results[2]["summary"] == "SEO se mění."
+    assert "top_articles" not in results[2]
+
+
+def test_batch_block_without_summary_falls_back(monkeypatch):
+    reply = "### TÉMA 1 ###\nNesmysl bez sekcí\n### TÉMA 2 ###\nSOUHRN: Druhé.\n### TÉMA 3 ###\nSOUHRN: Třetí."
+    summarizer, _ = _batch_summarizer(monkeypatch, reply)
+
+    results = asyncio.run(summarizer.summarize_topic_batch_async(_GROUPS))
+
+    assert results[0] == summarizer._fallback_summary("ga4", _GROUPS[0][1])
+    assert [r["summary"] for r in results[1:]] == ["Druhé.", "Třetí."]
@@ -0,0 +1,39 @@
+"""Testy sdíleného čištění textu před TF-IDF."""
+
+import html
+import re
+
+from src.processing.textclean import normalize
+
+_SAMPLES = [
+    "GA4 &amp; BigQuery: <b>an</b> AI update for the EU and UK",
+    'Read <a href="https://example.com/x">more</a> at https://example.com/a?b=1 now',
+    "Color ff00aa and 6f6f6f are gone, 1234567 stays",
+    "Go to a VR or AR demo in JS &nbsp; today",
+    "",
+]
+
+
+def _old_cluster_clean(text: str) -> str:
+    """Původní čištění dokumentů v TopicClusterer (před sdíleným normalize)."""
+    text = html.unescape(text)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"\b[0-9a-f]{6}\b", " ", text)
+    text = re.sub(r"https?://\S+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def test_keep_short_matches_old_cluster_cleaning():
+    for text in _SAMPLES:
+        assert normalize(text, drop_short=False) == _old_cluster_clean(text)
+
+
+def test_drop_short_tokens():
+    assert normalize("we go to an AI or ml meetup in the EU") == "AI ml meetup the EU"
+    assert normalize("we go to an AI or ml meetup in the EU", drop_short=False) == (
+        "we go to an AI or ml meetup in the EU"
+    )
+
+
+def test_strips_markup_urls_and_hex():
+    assert normalize("<p>Hello</p> https://x.com/a 6f6f6f &amp; world") == "Hello & world"